@@ -2,7 +2,8 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from csv_data_loader import CSVDataLoader
 from models import SentimentAnalyzer
-from aspect_extractor import AspectExtractor
+from inference_scheduler import InferenceScheduler
+from aspect_pipeline import AspectSentimentPipeline
 import logging
 
 # Setup logging
@@ -12,11 +13,26 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Review pagination for /api/product
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Search results for /api/search (queries are sent on every keystroke)
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
 # Initialize components
 logger.info("🚀 Initializing components...")
 data_loader = CSVDataLoader('reviews_dataset.csv')
 sentiment_analyzer = SentimentAnalyzer()
-aspect_extractor = AspectExtractor()
+sentiment_analyzer.warmup()
+# Request threads share batched forward passes through the scheduler
+inference_scheduler = InferenceScheduler(sentiment_analyzer)
+# Aspects are extracted with the taxonomy of each product's category; their
+# snippets are scored through the scheduler
+aspect_pipeline = AspectSentimentPipeline(
+    sentiment_analyzer, data_loader=data_loader, scheduler=inference_scheduler
+)
 logger.info("✅ Components initialized")
 
 @app.route('/api/products', methods=['GET'])
@@ -38,16 +54,44 @@ def get_products():
 
 @app.route('/api/product/<product_name>', methods=['GET'])
 def get_product_details(product_name):
-    """Get detailed information about a product"""
+    """Get detailed information about a product
+    
+    Reviews are paginated with ?limit=&offset= and can be filtered with
+    ?language=, ?aspect= and ?min_rating=.
+    """
     try:
-        product_data = data_loader.get_product_data(product_name)
+        summary = data_loader.get_product_summary(product_name)
         
-        if not product_data:
+        if not summary:
             return jsonify({'error': 'Product not found'}), 404
         
-        # Add overall score
-        product_data['overall_score'] = data_loader.get_overall_score(product_name)
-        product_data['language_stats'] = data_loader.get_language_stats(product_name)
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        
+        page = data_loader.get_reviews_page(
+            product_name,
+            limit=min(max(limit, 1), MAX_PAGE_SIZE),
+            offset=max(offset, 0),
+            language=request.args.get('language'),
+            aspect=request.args.get('aspect'),
+            min_rating=request.args.get('min_rating', type=int)
+        )
+        
+        product_data = {
+            'product_name': product_name,
+            'category': summary['category'],
+            'reviews': page['reviews'],
+            'pagination': {
+                'total': page['total'],
+                'offset': page['offset'],
+                'limit': page['limit'],
+                'next_offset': page['next_offset']
+            },
+            'aspect_scores': summary['aspect_scores'],
+            'total_reviews': summary['total_reviews'],
+            'overall_score': summary['overall_score'],
+            'language_stats': summary['language_stats']
+        }
         
         return jsonify(product_data)
     
@@ -76,7 +120,8 @@ def compare_products():
                 'strengths': {},
                 'weaknesses': {},
                 'reviewsFound': {},
-                'languageStats': {}
+                'languageStats': {},
+                'modelAspectScores': {}
             }
         }
         
@@ -88,8 +133,8 @@ def compare_products():
         for product in products:
             logger.info(f"🔍 Analyzing: {product}")
             
-            # Get product data from CSV
-            product_data = data_loader.get_product_data(product)
+            # Get cached product summary
+            product_data = data_loader.get_product_summary(product)
             
             if not product_data:
                 logger.warning(f"⚠️ No data found for {product}")
@@ -105,6 +150,7 @@ def compare_products():
                 results['comparison']['reviews'][product] = []
                 results['comparison']['strengths'][product] = []
                 results['comparison']['weaknesses'][product] = []
+                results['comparison']['modelAspectScores'][product] = {}
                 
                 continue
             
@@ -113,7 +159,7 @@ def compare_products():
             results['comparison']['reviewsFound'][product] = True
             
             # Get overall score
-            overall_score = data_loader.get_overall_score(product)
+            overall_score = product_data['overall_score']
             
             # Determine sentiment
             if overall_score >= 7:
@@ -130,12 +176,17 @@ def compare_products():
             })
             
             # Get sample reviews (mix of languages)
-            reviews = product_data['reviews']
-            sample_reviews = reviews[:5]  # Top 5 reviews
-            results['comparison']['reviews'][product] = sample_reviews
+            results['comparison']['reviews'][product] = product_data['sample_reviews']
             
             # Get language statistics
-            results['comparison']['languageStats'][product] = data_loader.get_language_stats(product)
+            results['comparison']['languageStats'][product] = product_data['language_stats']
+            
+            # Model-based aspect scores from aspect-specific sentences; computed in the
+            # background, so a product scored for the first time shows none yet
+            model_aspects = aspect_pipeline.score_product(product, wait=False)
+            results['comparison']['modelAspectScores'][product] = (
+                model_aspects['aspect_scores'] if model_aspects else {}
+            )
             
             # Get aspect scores
             aspect_scores = product_data['aspect_scores']
@@ -195,11 +246,14 @@ def search_products():
     try:
         query = request.args.get('q', '')
         category = request.args.get('category')
+        limit = request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int)
         
         if not query:
             return jsonify({'error': 'Query parameter required'}), 400
         
-        products = data_loader.search_products(query, category)
+        products = data_loader.search_products(
+            query, category, min(max(limit, 1), MAX_SEARCH_LIMIT)
+        )
         
         return jsonify({
             'query': query,
@@ -219,7 +273,9 @@ def health_check():
         'version': '3.0.0',
         'data_source': 'CSV',
         'total_products': len(data_loader.get_all_products()),
-        'categories': data_loader.get_categories()
+        'categories': data_loader.get_categories(),
+        'inference': inference_scheduler.metrics(),
+        'prediction_cache': sentiment_analyzer.cache.stats() if sentiment_analyzer.cache else None
     })
 
 @app.route('/api/stats', methods=['GET'])
@@ -1,60 +1,251 @@
+import bisect
+import functools
 import json
+import logging
+import multiprocessing
+import os
 import re
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# One <category>.json per product category: aspect -> language -> keywords
+TAXONOMY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'aspect_taxonomies')
+DEFAULT_CATEGORY = 'phone'  # used for categories without a taxonomy file
+COMPILED_DIR = 'compiled'  # subdirectory of TAXONOMY_DIR holding compiled matchers
+COMPILED_VERSION = 1  # bump when the compiled format changes
+
+GENERAL_ASPECT = 'General'  # label for reviews that mention no aspect keyword
+# A sentence runs up to the next । . ! or ?, without surrounding whitespace
+SENTENCE_PATTERN = re.compile(r'[^।.!?\s](?:[^।.!?]*[^।.!?\s])?')
+BATCH_CHUNK_SIZE = 20000  # reviews per task when extraction runs in worker processes
+
+_worker_extractor = None
+
+
+def _init_worker(extractor):
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_chunk(task):
+    start, texts = task
+    return _worker_extractor._match_frame(texts, start)
+
+
+def taxonomy_categories(taxonomy_dir=TAXONOMY_DIR) -> List[str]:
+    """Categories that have a taxonomy file"""
+    return sorted(
+        os.path.splitext(name)[0] for name in os.listdir(taxonomy_dir) if name.endswith('.json')
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_extractor(category=DEFAULT_CATEGORY, taxonomy_dir=TAXONOMY_DIR):
+    """Shared AspectExtractor for a product category (the default one if it has no taxonomy)"""
+    category = str(category).lower() if category else DEFAULT_CATEGORY
+    if not os.path.exists(os.path.join(taxonomy_dir, f'{category}.json')):
+        category = DEFAULT_CATEGORY
+    return AspectExtractor(category, taxonomy_dir)
 
 class AspectExtractor:
-    def __init__(self):
-        """Initialize aspect keywords"""
+    def __init__(self, category=DEFAULT_CATEGORY, taxonomy_dir=TAXONOMY_DIR):
+        """Load the aspect keywords of a product category
+        
+        The taxonomy is read from <taxonomy_dir>/<category>.json and its
+        compiled matcher is cached under <taxonomy_dir>/compiled/, so later
+        starts skip building the matcher while the file is unchanged.
+        """
+        self.category = category
+        path = os.path.join(taxonomy_dir, f'{category}.json')
+        
+        with open(path, encoding='utf-8') as f:
+            taxonomy = json.load(f)
+        
         self.aspect_keywords = {
-            'Camera': [
-                'कैमरा', 'camera', 'फोटो', 'photo', 'पिक्चर', 'picture',
-                'कॅमेरा', 'फोटो', 'चित्र', 'selfie', 'video'
-            ],
-            'Battery': [
-                'बैटरी', 'battery', 'बैकअप', 'backup', 'चार्जिंग', 'charging',
-                'charge', 'power', 'बॅटरी'
-            ],
-            'Performance': [
-                'परफॉर्मेंस', 'performance', 'स्पीड', 'speed', 'तेज', 'fast',
-                'slow', 'lag', 'gaming', 'processor', 'ram', 'परफॉर्मन्स'
-            ],
-            'Display': [
-                'डिस्प्ले', 'display', 'स्क्रीन', 'screen', 'आकार', 'size',
-                'brightness', 'color', 'clarity', 'डिस्पले'
-            ],
-            'Value': [
-                'कीमत', 'price', 'दाम', 'पैसा', 'value', 'money', 'worth',
-                'महाग', 'किंमत', 'costly', 'cheap'
-            ],
-            'Build Quality': [
-                'बिल्ड', 'build', 'quality', 'design', 'डिज़ाइन', 'look',
-                'body', 'material', 'finish', 'गुणवत्ता'
-            ]
+            aspect: [keyword for keywords in languages.values() for keyword in keywords]
+            for aspect, languages in taxonomy.items()
         }
+        
+        self._load_compiled(path)
+    
+    def compile(self):
+        """Compile aspect_keywords into one matcher (call again after changing them)"""
+        keyword_aspects = {}
+        for aspect, keywords in self.aspect_keywords.items():
+            for keyword in keywords:
+                keyword_aspects.setdefault(keyword, set()).add(aspect)
+        
+        self.matcher = KeywordMatcher(keyword_aspects)
+        self.aspect_order = {aspect: i for i, aspect in enumerate(self.aspect_keywords)}
+    
+    def _load_compiled(self, path):
+        """Reuse the compiled matcher saved for this taxonomy file, or compile and save it"""
+        stat = os.stat(path)
+        signature = f"{COMPILED_VERSION}-{stat.st_size}-{stat.st_mtime_ns}"
+        cache_path = os.path.join(os.path.dirname(path), COMPILED_DIR, os.path.basename(path))
+        
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['signature'] == signature:
+                self.matcher = KeywordMatcher.from_state(cached['matcher'])
+                self.aspect_order = {aspect: i for i, aspect in enumerate(self.aspect_keywords)}
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        self.compile()
+        
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'signature': signature, 'matcher': self.matcher.to_state()}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache compiled taxonomy {cache_path}: {e}")
+    
+    def find_aspects(self, text):
+        """(start, end, aspect) for every keyword match in text, in one scan"""
+        return [
+            (start, end, aspect)
+            for start, end, keyword in self.matcher.finditer_all(text)
+            for aspect in self.matcher.labels[keyword]
+        ]
     
     def extract_aspects(self, text):
         """Extract mentioned aspects from text"""
-        text_lower = text.lower()
-        found_aspects = []
+        found = {
+            aspect
+            for keyword in self.matcher.find(text)
+            for aspect in self.matcher.labels[keyword]
+        }
         
-        for aspect, keywords in self.aspect_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    if aspect not in found_aspects:
-                        found_aspects.append(aspect)
-                    break
+        return sorted(found, key=self.aspect_order.__getitem__)
+    
+    def _match_frame(self, texts, start=0):
+        """(row, aspect, offset) for every keyword match; rows are numbered from start"""
+        rows, aspects, offsets = [], [], []
+        labels = self.matcher.labels
+        
+        for row, text in enumerate(texts, start):
+            for offset, _, keyword in self.matcher.finditer_all(text):
+                for aspect in labels[keyword]:
+                    rows.append(row)
+                    aspects.append(aspect)
+                    offsets.append(offset)
         
-        return found_aspects
+        return pd.DataFrame({
+            'row': np.array(rows, dtype='int64'),
+            'aspect': pd.Categorical(aspects, categories=list(self.aspect_keywords)),
+            'offset': np.array(offsets, dtype='int64')
+        })
     
-    def get_aspect_sentences(self, text, aspect):
-        """Extract sentences mentioning specific aspect"""
-        sentences = re.split(r'[।.!?]', text)
-        aspect_sentences = []
+    def extract_aspects_batch(self, texts, output='long', workers=None, chunk_size=BATCH_CHUNK_SIZE):
+        """Extract aspects for a whole column of reviews
+        
+        output='long': one row per keyword match with columns row (position
+        in texts), aspect and offset (character where the keyword starts).
+        output='matrix': sparse boolean review x aspect DataFrame with the
+        index of texts; .sparse.to_coo() gives a scipy matrix.
+        workers: split texts into chunks of chunk_size reviews and match
+        them in that many processes (None runs in this process).
+        """
+        series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts))
+        values = series.fillna('').astype(str).tolist()
+        
+        if workers and workers > 1 and len(values) > chunk_size:
+            tasks = [(i, values[i:i + chunk_size]) for i in range(0, len(values), chunk_size)]
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+                matches = pd.concat(pool.map(_extract_chunk, tasks), ignore_index=True)
+        else:
+            matches = self._match_frame(values)
         
-        keywords = self.aspect_keywords.get(aspect, [])
+        if output == 'long':
+            return matches
+        if output != 'matrix':
+            raise ValueError(f"output must be 'long' or 'matrix', got {output!r}")
+        
+        mentioned = np.zeros((len(values), len(self.aspect_keywords)), dtype=bool)
+        mentioned[matches['row'].to_numpy(), matches['aspect'].cat.codes.to_numpy()] = True
+        
+        return pd.DataFrame({
+            aspect: pd.arrays.SparseArray(mentioned[:, i], fill_value=False)
+            for i, aspect in enumerate(self.aspect_keywords)
+        }, index=series.index)
+    
+    def label_aspects(self, texts, default=GENERAL_ASPECT, workers=None):
+        """One aspect per review: the aspect mentioned first, or default if none is"""
+        series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts))
+        matches = self.extract_aspects_batch(series, workers=workers)
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if any(keyword.lower() in sentence.lower() for keyword in keywords):
-                aspect_sentences.append(sentence)
+        first = matches.sort_values(['row', 'offset'], kind='stable').drop_duplicates('row')
+        labels = np.full(len(series), default, dtype=object)
+        labels[first['row'].to_numpy()] = first['aspect'].astype(object).to_numpy()
         
-        return aspect_sentences
\ No newline at end of file
+        return pd.Series(labels, index=series.index, name='aspect')
+    
+    def sentence_spans(self, text):
+        """(start, end) of every non-empty sentence in text"""
+        return [match.span() for match in SENTENCE_PATTERN.finditer(text)]
+    
+    def get_aspect_spans(self, text, aspects=None):
+        """aspect -> (start, end) of each sentence mentioning it
+        
+        The text is split once and scanned once for all aspects; keyword
+        matches are assigned to sentences by offset. aspects limits the
+        result to those aspects.
+        """
+        spans = self.sentence_spans(text)
+        starts = [start for start, _ in spans]
+        found = {}
+        
+        for offset, _, keyword in self.matcher.finditer_all(text):
+            i = bisect.bisect_right(starts, offset) - 1
+            if i < 0 or offset >= spans[i][1]:
+                continue
+            
+            for aspect in self.matcher.labels[keyword]:
+                if aspects is not None and aspect not in aspects:
+                    continue
+                # Matches come in text order, so a repeat is always the last span added
+                sentences = found.setdefault(aspect, [])
+                if not sentences or sentences[-1] != spans[i]:
+                    sentences.append(spans[i])
+        
+        return {aspect: found[aspect] for aspect in self.aspect_keywords if aspect in found}
+    
+    def get_aspect_spans_batch(self, texts, aspects=None):
+        """get_aspect_spans() for many texts: one row per (row, aspect, start, end)
+        
+        Only offsets are returned, so callers slice out the sentences they
+        actually score (e.g. after dropping duplicates).
+        """
+        rows, found_aspects, starts, ends = [], [], [], []
+        
+        for row, text in enumerate(texts):
+            for aspect, spans in self.get_aspect_spans(str(text), aspects).items():
+                for start, end in spans:
+                    rows.append(row)
+                    found_aspects.append(aspect)
+                    starts.append(start)
+                    ends.append(end)
+        
+        return pd.DataFrame({
+            'row': np.array(rows, dtype='int64'),
+            'aspect': pd.Categorical(found_aspects, categories=list(self.aspect_keywords)),
+            'start': np.array(starts, dtype='int64'),
+            'end': np.array(ends, dtype='int64')
+        })
+    
+    def get_aspect_sentences(self, text, aspect):
+        """Extract sentences mentioning specific aspect"""
+        spans = self.get_aspect_spans(text, (aspect,)).get(aspect, [])
+        return [text[start:end] for start, end in spans]
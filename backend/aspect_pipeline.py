@@ -0,0 +1,159 @@
+"""
+aspect_pipeline.py - Model-based aspect scores from the review sentences that mention each aspect
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from aspect_extractor import get_extractor
+
+logger = logging.getLogger(__name__)
+
+ASPECT_CACHE_SIZE = 256  # products whose aspect scores are kept
+
+
+class AspectSentimentPipeline:
+    """Scores each aspect of a product from aspect-specific snippets
+
+    Reviews are split into sentences and each sentence is mapped to the
+    aspects it mentions. Identical snippets are scored once, and all
+    snippets of a product go through SentimentAnalyzer.predict_batch
+    together, or are submitted to an InferenceScheduler when one is given
+    so they share forward passes with other request threads. Unless an
+    extractor is given, aspects come from the taxonomy of the product's
+    category. An aspect's score is the mean sentiment of its mentions on
+    the 0-100 scale of the star-based aspect_scores.
+
+    Results per product are kept in an LRU keyed by the product and the
+    model fingerprint, tagged with the product's version from the data
+    loader; appends to other products leave them valid. Products are scored
+    on a background thread: a stale result is served while it is refreshed.
+    """
+
+    def __init__(self, sentiment_analyzer, aspect_extractor=None, data_loader=None,
+                 cache_size=ASPECT_CACHE_SIZE, scheduler=None):
+        self.sentiment_analyzer = sentiment_analyzer
+        self.scheduler = scheduler
+        self.aspect_extractor = aspect_extractor
+        self.data_loader = data_loader
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()  # (product, fingerprint) -> (product version, result)
+        self._pending = {}  # (product, fingerprint) -> Future of the running refresh
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='aspect-refresh')
+
+    def _extractor(self, category: Optional[str] = None):
+        return self.aspect_extractor or get_extractor(category)
+
+    def aspect_snippets(self, texts: Iterable[str], category: Optional[str] = None) -> Dict[str, List[str]]:
+        """aspect -> every sentence that mentions it (repeats kept, one per mention)"""
+        texts = [str(text) for text in texts]
+        spans = self._extractor(category).get_aspect_spans_batch(texts)
+        snippets = {}
+
+        for row, aspect, start, end in spans.itertuples(index=False, name=None):
+            snippets.setdefault(aspect, []).append(texts[row][start:end])
+
+        return snippets
+
+    def score_texts(self, texts: Iterable[str], category: Optional[str] = None) -> Dict:
+        """Per-aspect scores (0-100) and mention counts for a set of reviews"""
+        snippets = self.aspect_snippets(texts, category)
+
+        # One batched pass over the distinct snippets of every aspect
+        unique = list(dict.fromkeys(
+            snippet for aspect_snippets in snippets.values() for snippet in aspect_snippets
+        ))
+        results = self._predict(unique) if unique else []
+        scores = {snippet: result['score'] for snippet, result in zip(unique, results)}
+
+        return {
+            'aspect_scores': {
+                aspect: int(sum(scores[s] for s in aspect_snippets) / len(aspect_snippets) * 100)
+                for aspect, aspect_snippets in sorted(snippets.items())
+            },
+            'mentions': {
+                aspect: len(aspect_snippets) for aspect, aspect_snippets in sorted(snippets.items())
+            },
+            'snippets_scored': len(unique)
+        }
+
+    def _predict(self, texts: List[str]) -> List[Dict]:
+        """predict_batch() results for texts, through the scheduler if there is one"""
+        if self.scheduler is None:
+            return self.sentiment_analyzer.predict_batch(texts, verbose=False)
+
+        futures = [self.scheduler.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def score_product(self, product_name: str, wait: bool = True) -> Optional[Dict]:
+        """Cached score_texts() over all reviews of a product (None if it has none)
+
+        A missing or outdated result is recomputed on the background thread.
+        An outdated result is returned meanwhile; with nothing cached, the
+        call waits for the refresh unless wait is False (then it returns None).
+        """
+        version = self.data_loader.get_product_version(product_name)
+        if version is None:
+            return None
+
+        key = (product_name.lower().strip(), self.sentiment_analyzer.fingerprint)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+
+        if entry is not None and entry[0] == version:
+            return dict(entry[1])
+
+        future = self._refresh(product_name, key, version)
+        if entry is not None:
+            return dict(entry[1])
+        if not wait:
+            return None
+
+        result = future.result()
+        return dict(result) if result is not None else None
+
+    def _refresh(self, product_name: str, key, version) -> Future:
+        """Score a product on the background thread, once per key at a time"""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._score_and_cache, product_name, key, version)
+                self._pending[key] = future
+        return future
+
+    def _score_and_cache(self, product_name: str, key, version) -> Optional[Dict]:
+        try:
+            summary = self.data_loader.get_product_summary(product_name)
+            if summary is None:
+                return None
+
+            # Only the text column is read, no review dicts are built
+            texts = self.data_loader.get_product_texts(product_name)
+            result = self.score_texts(texts, summary['category'])
+            logger.info(f"🧠 Scored {result['snippets_scored']} aspect snippets for {product_name}")
+
+            with self._lock:
+                self._cache[key] = (version, result)
+                self._cache.move_to_end(key)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+            return result
+        except Exception as e:
+            logger.error(f"❌ Could not score aspects of {product_name}: {e}", exc_info=True)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def clear_cache(self):
+        """Drop all cached product results"""
+        with self._lock:
+            self._cache.clear()
@@ -1,21 +1,99 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Union
+import io
+import json
 import logging
+import os
+import sys
+import threading
+
+from aspect_extractor import get_extractor
+from search_index import ProductSearchIndex
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # columnar cache is optional
+    pa = None
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_CACHE_SIZE = 256  # products kept in the summary LRU
+SAMPLE_REVIEWS_COUNT = 5
+STREAMING_CHUNK_SIZE = 100_000  # rows parsed at a time by StreamingCSVDataLoader
+REVIEW_FIELDS = ['text', 'rating', 'aspect', 'language']
+LANGUAGE_STATS_KEYS = ['hindi', 'marathi']
+CATEGORICAL_COLUMNS = ['category', 'aspect', 'language', 'product_name']
+CSV_COLUMNS = ['product_name', 'category', 'text', 'rating', 'aspect', 'language']
+TAIL_COMPACT_RATIO = 0.1  # merge appended rows into the main table past this fraction
+CACHE_SIGNATURE_KEY = b'autosentiment.csv_signature'
+
+
+def _deep_size(obj) -> int:
+    """Approximate bytes of nested dicts/lists of strings and numbers"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key) + _deep_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_deep_size(item) for item in obj)
+    return size
+
+
 class CSVDataLoader:
-    def __init__(self, csv_path='reviews_dataset.csv'):
-        """Initialize CSV data loader"""
+    def __init__(self, csv_path='reviews_dataset.csv', summary_cache_size=SUMMARY_CACHE_SIZE,
+                 precompute_aggregates=False, use_cache=True, arrow_text=False):
+        """Initialize CSV data loader
+        
+        precompute_aggregates: compute every product's rating sums/counts in
+        one groupby pass at load time instead of per product on first use.
+        use_cache: keep a columnar copy of the CSV next to it (<name>.arrow)
+        and memory-map it on later starts while the CSV is unchanged.
+        arrow_text: keep review text as Arrow-backed strings instead of
+        Python objects (requires pyarrow).
+        """
         self.csv_path = csv_path
+        self._tail = []
+        self._tail_starts = []
+        self.cache_path = os.path.splitext(csv_path)[0] + '.arrow'
+        self.use_cache = use_cache and pa is not None
+        self.arrow_text = arrow_text and pa is not None
         self.df = None
+        self._product_index = {}
+        self._catalog = None
+        self._catalog_pairs = set()
+        self._catalog_pending = []
+        self._search_index = None
+        self.precompute_aggregates = precompute_aggregates
+        self._product_totals = None
+        self._aspect_totals = None
+        self._language_counts = None
+        self._file_signature = None
+        self._generation = 0  # bumped on every (re)load; appends keep it
+        self._summary_cache = OrderedDict()
+        self._summary_cache_size = summary_cache_size
+        self._summary_lock = threading.Lock()
+        # Guards the table, tail, indexes and totals; readers take it too so
+        # they never see an append or a reload half done
+        self._data_lock = threading.RLock()
         self.load_data()
     
     def load_data(self):
         """Load reviews from CSV file"""
+        self._file_signature = self._get_file_signature()
+        self._generation += 1
+        self._tail = []
+        self._tail_starts = []
+        
         try:
-            self.df = pd.read_csv(self.csv_path, encoding='utf-8')
+            self.df = self._read_cache()
+            
+            if self.df is None:
+                df = self._clean_data(pd.read_csv(self.csv_path, encoding='utf-8'))
+                self.df = self._apply_schema(df)
+                self._write_cache()
+            
             logger.info(f"✅ Loaded {len(self.df)} reviews from {self.csv_path}")
             logger.info(f"📊 Categories: {self.df['category'].unique()}")
             logger.info(f"📱 Products: {self.df['product_name'].unique()}")
@@ -25,152 +103,634 @@ class CSVDataLoader:
         except Exception as e:
             logger.error(f"❌ Error loading CSV: {e}")
             self.df = pd.DataFrame()
+        
+        self._build_product_index()
+        self._build_catalog()
+        self._build_aggregates()
+        self.clear_summary_cache()
+    
+    @staticmethod
+    def _clean_data(df: pd.DataFrame) -> pd.DataFrame:
+        """Make ratings numeric so aggregations run on the column directly"""
+        ratings = pd.to_numeric(df['rating'], errors='coerce')
+        
+        # Drop malformed rows, e.g. a header line repeated by an earlier concatenation
+        invalid = ratings.isna()
+        if invalid.any():
+            logger.warning(f"⚠️ Skipping {int(invalid.sum())} rows without a numeric rating")
+            df = df[~invalid].reset_index(drop=True)
+            ratings = ratings[~invalid].reset_index(drop=True)
+        
+        df['rating'] = ratings
+        
+        # Scraped CSVs carry no aspect column; label each review from its text
+        # with the aspect taxonomy of its category
+        if 'aspect' not in df.columns:
+            aspects = pd.Series(None, index=df.index, dtype=object)
+            for category, rows in df.groupby('category', sort=False, dropna=False).groups.items():
+                aspects[rows] = get_extractor(category).label_aspects(df.loc[rows, 'text'])
+            df['aspect'] = aspects
+            logger.info(f"🏷️ Labelled aspects of {len(df)} reviews from their text")
+        
+        return df
     
-    def get_product_reviews(self, product_name: str, language: Optional[str] = None) -> List[Dict]:
-        """Get all reviews for a product"""
+    def _apply_schema(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compact dtypes: categoricals for low-cardinality columns, int8 ratings"""
+        dtypes = {column: 'category' for column in CATEGORICAL_COLUMNS}
+        dtypes['rating'] = np.int8  # ratings are 1-5
+        if self.arrow_text:
+            dtypes['text'] = pd.ArrowDtype(pa.string())
+        
+        return df.astype(dtypes)
+    
+    def memory_report(self) -> Dict[str, int]:
+        """Print in-memory bytes per column of the review table"""
         if self.df is None or self.df.empty:
-            return []
+            print("No data loaded")
+            return {}
+        
+        usage = self.df.memory_usage(deep=True, index=False)
+        
+        for column, size in usage.items():
+            print(f"{column:<15} {str(self.df[column].dtype):<20} {size:>12,} bytes")
+        print(f"{'total':<36} {int(usage.sum()):>12,} bytes")
+        
+        return {column: int(size) for column, size in usage.items()}
+    
+    def _read_cache(self) -> Optional[pd.DataFrame]:
+        """Memory-map the columnar cache if it was built from the current CSV"""
+        if not self.use_cache or self._file_signature is None:
+            return None
         
-        # Normalize product name for matching
+        try:
+            table = feather.read_table(self.cache_path, memory_map=True)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable cache {self.cache_path}: {e}")
+            return None
+        
+        metadata = table.schema.metadata or {}
+        if metadata.get(CACHE_SIGNATURE_KEY) != json.dumps(self._file_signature).encode():
+            logger.info(f"🔄 Cache {self.cache_path} is stale, reading CSV")
+            return None
+        
+        logger.info(f"⚡ Using columnar cache {self.cache_path}")
+        
+        # Dictionary-encoded columns come back as pandas categoricals; Arrow
+        # text stays backed by the mapped file instead of being copied
+        types_mapper = {pa.string(): pd.ArrowDtype(pa.string())}.get if self.arrow_text else None
+        return self._apply_schema(table.to_pandas(types_mapper=types_mapper))
+    
+    def _write_cache(self):
+        """Write the loaded reviews to the columnar sidecar file"""
+        if not self.use_cache or self.df.empty or self._file_signature is None:
+            return
+        
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            CACHE_SIGNATURE_KEY: json.dumps(self._file_signature).encode()
+        })
+        
+        # Uncompressed so later starts can memory-map it; rename for atomicity
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self.cache_path)
+            logger.info(f"💾 Wrote columnar cache {self.cache_path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write cache {self.cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _get_file_signature(self):
+        """(mtime, size) of the CSV, used to detect changes on disk"""
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _check_for_changes(self):
+        """Reload the dataset if the CSV was modified since it was loaded"""
+        with self._data_lock:
+            if self._get_file_signature() != self._file_signature:
+                logger.info(f"🔄 {self.csv_path} changed on disk, reloading")
+                self.load_data()
+    
+    def get_product_version(self, product_name: str):
+        """Token that changes whenever the reviews matching product_name change (None if there are none)
+        
+        Appends to other products leave it as is.
+        """
+        with self._data_lock:
+            self._check_for_changes()
+            positions = self._match_rows(product_name)
+            if not len(positions):
+                return None
+            # Rows are only ever appended between reloads, so the count and
+            # the last position change whenever a matching row is added
+            return (self._generation, len(positions), int(positions[-1]))
+    
+    def clear_summary_cache(self):
+        """Drop all cached product summaries"""
+        with self._summary_lock:
+            self._summary_cache.clear()
+    
+    def _build_product_index(self):
+        """Map each lowercase product name to the row positions of its reviews
+        
+        Positions are stored as a list of arrays: appends add an array and
+        the next read of the product joins them into one.
+        """
+        self._product_index = {}
+        
+        if self.df is None or self.df.empty:
+            return
+        
+        names = self.df['product_name'].str.lower()
+        self._product_index = {
+            name: [rows] for name, rows in self.df.groupby(names, sort=False).indices.items()
+        }
+    
+    def _build_catalog(self):
+        """Collect the distinct (product_name, category) pairs"""
+        if self.df is None or self.df.empty:
+            self._set_catalog(pd.DataFrame(columns=['product_name', 'category']))
+            return
+        
+        self._set_catalog(self.df[['product_name', 'category']].drop_duplicates())
+    
+    def _set_catalog(self, catalog: pd.DataFrame):
+        """Store the product catalog and index its names for search"""
+        self._catalog = catalog.dropna().astype(str).reset_index(drop=True)
+        pairs = list(self._catalog.itertuples(index=False, name=None))
+        self._catalog_pairs = set(pairs)
+        self._catalog_pending = []
+        self._search_index = ProductSearchIndex(pairs)
+    
+    def _get_catalog(self) -> pd.DataFrame:
+        """Product catalog including the pairs added by appends since it was last read"""
+        if self._catalog_pending:
+            pending = pd.DataFrame(self._catalog_pending, columns=['product_name', 'category'])
+            self._catalog = pd.concat([self._catalog, pending], ignore_index=True)
+            self._catalog_pending = []
+        return self._catalog
+    
+    def _build_aggregates(self):
+        """Rating sums/counts per product and per (product, aspect), review counts per (product, language)"""
+        self._product_totals = None
+        self._aspect_totals = None
+        self._language_counts = None
+        
+        if not self.precompute_aggregates or self.df is None or self.df.empty:
+            return
+        
+        self._product_totals, self._aspect_totals, self._language_counts = {}, {}, {}
+        self._merge_totals(self._compute_totals(self.df))
+        
+        logger.info(f"📈 Precomputed aggregates for {len(self._product_index)} products")
+    
+    @staticmethod
+    def _compute_totals(df: pd.DataFrame):
+        """Group review rows into product and (product, aspect) rating totals and (product, language) counts
+        
+        Returns plain dicts: name -> [sum, count], name -> {aspect: [sum, count]}
+        and name -> {language: count}. Rows without an aspect still count
+        towards their product's total.
+        """
+        names = df['product_name'].str.lower().rename('product_name')
+        ratings = df['rating'].astype(np.int64)
+        
+        by_product = ratings.groupby(names, sort=False).agg(['sum', 'count'])
+        by_aspect = (
+            ratings.groupby([names, df['aspect']], sort=False, observed=True)
+            .agg(['sum', 'count'])
+        )
+        by_language = df.groupby([names, df['language']], sort=False, observed=True).size()
+        
+        product_totals = {
+            name: [total, count] for name, total, count
+            in zip(by_product.index, by_product['sum'].tolist(), by_product['count'].tolist())
+        }
+        aspect_totals = {}
+        for (name, aspect), total, count in zip(
+            by_aspect.index, by_aspect['sum'].tolist(), by_aspect['count'].tolist()
+        ):
+            aspect_totals.setdefault(name, {})[aspect] = [total, count]
+        language_counts = {}
+        for (name, language), count in zip(by_language.index, by_language.tolist()):
+            language_counts.setdefault(name, {})[language] = count
+        
+        return product_totals, aspect_totals, language_counts
+    
+    def _merge_totals(self, totals):
+        """Add totals from _compute_totals to the running totals in place"""
+        product_totals, aspect_totals, language_counts = totals
+        
+        for name, (total, count) in product_totals.items():
+            running = self._product_totals.setdefault(name, [0, 0])
+            running[0] += total
+            running[1] += count
+        
+        for name, aspects in aspect_totals.items():
+            product_aspects = self._aspect_totals.setdefault(name, {})
+            for aspect, (total, count) in aspects.items():
+                running = product_aspects.setdefault(aspect, [0, 0])
+                running[0] += total
+                running[1] += count
+        
+        for name, languages in language_counts.items():
+            product_languages = self._language_counts.setdefault(name, {})
+            for language, count in languages.items():
+                product_languages[language] = product_languages.get(language, 0) + count
+    
+    def _match_names(self, product_name: str) -> List[str]:
+        """Indexed (lowercase) product names that contain product_name"""
         product_lower = product_name.lower().strip()
         
-        # Find matching product (case-insensitive, partial match)
-        mask = self.df['product_name'].str.lower().str.contains(product_lower, na=False)
+        # Partial match runs over distinct names only, not over every review
+        return [name for name in self._product_index if product_lower in name]
+    
+    def _match_rows(self, product_name: str) -> np.ndarray:
+        """Row positions of all products whose name contains product_name"""
+        matches = [self._positions(name) for name in self._match_names(product_name)]
         
-        if language:
-            mask = mask & (self.df['language'] == language)
+        if not matches:
+            return np.empty(0, dtype=np.intp)
+        if len(matches) == 1:
+            return matches[0]
         
-        product_reviews = self.df[mask]
+        # Keep the original file order when several products match
+        return np.sort(np.concatenate(matches))
+    
+    def _positions(self, name: str) -> np.ndarray:
+        """Row positions of one indexed product, joining the arrays added by appends"""
+        chunks = self._product_index[name]
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        return chunks[0]
+    
+    def get_product_reviews(self, product_name: str, language: Optional[str] = None,
+                            aspect: Optional[str] = None, min_rating: Optional[int] = None,
+                            limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get reviews for a product, optionally filtered and paginated"""
+        return self.get_reviews_page(
+            product_name, limit, offset, language=language, aspect=aspect, min_rating=min_rating
+        )['reviews']
+    
+    def get_product_texts(self, product_name: str) -> List[str]:
+        """Text of every review of a product, in file order, without building review dicts"""
+        with self._data_lock:
+            positions = self._match_rows(product_name)
+            if not len(positions):
+                return []
+            texts = self._read_rows(positions)['text']
+        
+        return texts.fillna('').astype(str).tolist()
+    
+    def get_reviews_page(self, product_name: str, limit: Optional[int] = None, offset: int = 0,
+                         language: Optional[str] = None, aspect: Optional[str] = None,
+                         min_rating: Optional[int] = None) -> Dict:
+        """One page of a product's reviews plus the total number of matching reviews
+        
+        Only the rows of the requested page are converted to dicts.
+        """
+        with self._data_lock:
+            # Find matching product (case-insensitive, partial match)
+            positions = self._match_rows(product_name)
+            positions = self._filter_positions(positions, language, aspect, min_rating)
+            
+            end = None if limit is None else offset + limit
+            page = positions[offset:end]
+            rows = self._read_rows(page) if len(page) else None
         
-        if product_reviews.empty:
+        if not len(positions):
             logger.warning(f"⚠️ No reviews found for: {product_name}")
-            return []
-        
-        # Convert to list of dictionaries
-        reviews = []
-        for _, row in product_reviews.iterrows():
-            reviews.append({
-                'text': row['text'],
-                'rating': int(row['rating']),
-                'aspect': row['aspect'],
-                'language': row['language']
-            })
+        else:
+            logger.info(f"📝 Found {len(positions)} reviews for {product_name}")
         
-        logger.info(f"📝 Found {len(reviews)} reviews for {product_name}")
-        return reviews
+        return self._page_result(
+            self._to_records(rows) if rows is not None else [],
+            len(positions), limit, offset
+        )
     
-    def get_aspect_scores(self, product_name: str) -> Dict[str, int]:
-        """Calculate aspect scores from reviews"""
-        reviews = self.get_product_reviews(product_name)
+    @staticmethod
+    def _page_result(reviews: List[Dict], total: int, limit: Optional[int], offset: int) -> Dict:
+        """Page of reviews with the offset of the next page (None on the last page)"""
+        next_offset = offset + len(reviews)
         
-        if not reviews:
-            return {}
+        return {
+            'reviews': reviews,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            # An empty page (e.g. limit=0) would point back at itself forever
+            'next_offset': next_offset if reviews and next_offset < total else None
+        }
+    
+    def _filter_positions(self, positions: np.ndarray, language: Optional[str] = None,
+                          aspect: Optional[str] = None,
+                          min_rating: Optional[int] = None) -> np.ndarray:
+        """Keep the positions of reviews that pass the language/aspect/rating filters"""
+        if not len(positions) or not (language or aspect or min_rating is not None):
+            return positions
         
-        # Group by aspect and calculate average
-        aspect_scores = {}
+        rows = self._read_rows(positions)
+        mask = np.ones(len(rows), dtype=bool)
         
-        for review in reviews:
-            aspect = review['aspect']
-            rating = review['rating']
-            
-            if aspect not in aspect_scores:
-                aspect_scores[aspect] = []
-            
-            # Convert 1-5 rating to 0-100 score
-            aspect_scores[aspect].append(rating * 20)
+        if language:
+            mask &= (rows['language'] == language).to_numpy()
+        if aspect:
+            mask &= (rows['aspect'] == aspect).to_numpy()
+        if min_rating is not None:
+            mask &= (rows['rating'] >= min_rating).to_numpy()
+        
+        return positions[mask]
+    
+    def _read_rows(self, positions: np.ndarray) -> pd.DataFrame:
+        """Review rows at the given (ascending) positions"""
+        if not self._tail:
+            return self.df.iloc[positions]
+        
+        # Positions past the main table refer to rows appended since the last
+        # compaction; -1 selects the main table, i the i-th tail chunk
+        chunk_ids = np.searchsorted(self._tail_starts, positions, side='right') - 1
+        parts = [self.df.iloc[positions[chunk_ids < 0]]]
+        for i, chunk in enumerate(self._tail):
+            selected = positions[chunk_ids == i]
+            if len(selected):
+                parts.append(chunk.iloc[selected - self._tail_starts[i]])
+        
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+    
+    @staticmethod
+    def _to_records(rows: pd.DataFrame) -> List[Dict]:
+        """Convert review rows to the list-of-dicts shape used by the API"""
+        return rows[REVIEW_FIELDS].astype({'rating': int}).to_dict('records')
+    
+    def append_reviews(self, reviews: Union[pd.DataFrame, Iterable[Dict]]) -> int:
+        """Add new reviews without reloading; returns the number of rows added
+        
+        Rows are appended to the CSV and registered in the product index,
+        catalog and precomputed totals, so the work is proportional to the
+        number of new rows rather than to the size of the dataset.
+        """
+        df = reviews.copy() if isinstance(reviews, pd.DataFrame) else pd.DataFrame(list(reviews))
+        if df.empty:
+            return 0
+        
+        df = self._clean_data(df.reset_index(drop=True))[CSV_COLUMNS]
+        if df.empty:
+            return 0
+        
+        with self._data_lock:
+            positions = self._persist_rows(df)
+            self._register_rows(df, positions)
+            # Our own write is not an external change
+            self._file_signature = self._get_file_signature()
+        
+        logger.info(f"➕ Appended {len(df)} reviews to {self.csv_path}")
+        return len(df)
+    
+    def _append_to_csv(self, df: pd.DataFrame) -> int:
+        """Append rows to the CSV file; returns the byte offset where they start"""
+        exists = os.path.exists(self.csv_path) and os.path.getsize(self.csv_path) > 0
+        
+        # Never glue the first new row onto an unterminated last line
+        needs_newline = False
+        if exists:
+            with open(self.csv_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+        
+            # Write the file's own columns in its order: columns it lacks are dropped
+            # (e.g. aspect for scraped CSVs, re-derived on load), extra ones left empty
+            columns = pd.read_csv(self.csv_path, nrows=0, encoding='utf-8').columns
+            df = df.reindex(columns=columns)
+        
+        if 'rating' in df.columns:
+            df = df.astype({'rating': int})
+        
+        with open(self.csv_path, 'ab') as f:
+            if needs_newline:
+                f.write(b'\n')
+            start = f.tell()
+            f.write(df.to_csv(header=not exists, index=False).encode('utf-8'))
+        
+        return start
+    
+    def _persist_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Write new rows to the CSV and the in-memory table; returns their positions"""
+        self._append_to_csv(df)
+        
+        tail_rows = sum(len(chunk) for chunk in self._tail)
+        start = len(self.df) + tail_rows
+        self._tail.append(self._apply_schema(df))
+        self._tail_starts.append(start)
+        
+        # Keep chunk sizes decreasing by merging a chunk into the one before it
+        # while it is not smaller, so each row is copied O(log n) times
+        while len(self._tail) > 1 and len(self._tail[-2]) <= len(self._tail[-1]):
+            last = self._tail.pop()
+            self._tail_starts.pop()
+            self._tail[-1] = self._apply_schema(pd.concat([self._tail[-1], last], ignore_index=True))
+        
+        # Merge appended rows into the main table once they are a sizeable fraction of it
+        if tail_rows + len(df) > len(self.df) * TAIL_COMPACT_RATIO:
+            self.df = self._apply_schema(pd.concat([self.df, *self._tail], ignore_index=True))
+            self._tail = []
+            self._tail_starts = []
+        
+        return np.arange(start, start + len(df))
+    
+    def _register_rows(self, df: pd.DataFrame, positions: np.ndarray):
+        """Add new rows to the product index, catalog, running totals and summaries"""
+        names = df['product_name'].str.lower()
         
-        # Average scores
-        for aspect in aspect_scores:
-            aspect_scores[aspect] = int(np.mean(aspect_scores[aspect]))
+        for name, rows in df.groupby(names, sort=False).indices.items():
+            self._product_index.setdefault(name, []).append(positions[rows])
         
-        return aspect_scores
+        self._register_products(df[['product_name', 'category']])
+        
+        if self._aspect_totals is not None:
+            self._merge_totals(self._compute_totals(df))
+        
+        self._invalidate_summaries(set(names))
     
-    def get_product_data(self, product_name: str) -> Optional[Dict]:
-        """Get complete product data including reviews and scores"""
-        reviews = self.get_product_reviews(product_name)
+    def _register_products(self, pairs: pd.DataFrame):
+        """Add new (product_name, category) pairs to the catalog and search index"""
+        pairs = pairs.drop_duplicates().dropna().astype(str)
+        for pair in pairs.itertuples(index=False, name=None):
+            if pair not in self._catalog_pairs:
+                self._catalog_pairs.add(pair)
+                self._catalog_pending.append(pair)
+                self._search_index.add(*pair)
+    
+    def _invalidate_summaries(self, new_names: set):
+        """Drop cached summaries of every query that matches one of the given lowercase names"""
+        with self._summary_lock:
+            stale = [
+                key for key in self._summary_cache
+                if any(key in name for name in new_names)
+            ]
+            for key in stale:
+                del self._summary_cache[key]
+    
+    def get_product_summary(self, product_name: str) -> Optional[Dict]:
+        """Get cached aggregates for a product (scores, language stats, samples)"""
+        self._check_for_changes()
+        key = product_name.lower().strip()
+        
+        with self._summary_lock:
+            summary = self._summary_cache.get(key)
+            if summary is not None:
+                self._summary_cache.move_to_end(key)
+        
+        if summary is None:
+            # Compute and cache under the data lock so an append cannot
+            # invalidate the key in between and leave a stale summary behind
+            with self._data_lock:
+                summary = self._compute_summary(product_name)
+                if summary is None:
+                    return None
+                
+                with self._summary_lock:
+                    self._summary_cache[key] = summary
+                    if len(self._summary_cache) > self._summary_cache_size:
+                        self._summary_cache.popitem(last=False)
+        
+        # Callers add fields to the result, never hand out the cached dict
+        summary = dict(summary)
+        summary['product_name'] = product_name
+        return summary
+    
+    def _compute_summary(self, product_name: str) -> Optional[Dict]:
+        """Compute all per-product aggregates from the matching rows"""
+        positions = self._match_rows(product_name)
         
-        if not reviews:
+        if not len(positions):
             return None
         
-        aspect_scores = self.get_aspect_scores(product_name)
+        if self._aspect_totals is not None:
+            aggregates = self._aggregate_from_totals(self._match_names(product_name))
+        else:
+            aggregates = self._aggregate_rows(self._read_rows(positions))
         
-        # Get product category
-        product_lower = product_name.lower().strip()
-        mask = self.df['product_name'].str.lower().str.contains(product_lower, na=False)
-        category = self.df[mask]['category'].iloc[0] if not self.df[mask].empty else 'unknown'
+        sample_rows = self._read_rows(positions[:SAMPLE_REVIEWS_COUNT])
         
         return {
             'product_name': product_name,
-            'category': category,
-            'reviews': reviews,
-            'aspect_scores': aspect_scores,
-            'total_reviews': len(reviews)
+            'category': sample_rows['category'].iloc[0],
+            'total_reviews': len(positions),
+            **aggregates,
+            'sample_reviews': self._to_records(sample_rows)
         }
     
-    def search_products(self, query: str, category: Optional[str] = None) -> List[str]:
-        """Search for products by name or category"""
-        if self.df is None or self.df.empty:
-            return []
+    @staticmethod
+    def _aggregate_rows(rows: pd.DataFrame) -> Dict:
+        """Overall score, aspect scores and language stats from review rows"""
+        # Convert 1-5 rating to 0-100 score and average per aspect; widen the
+        # compact int8 ratings first so the sums cannot overflow
+        ratings = rows['rating'].astype(np.int64)
+        by_aspect = ratings.groupby(rows['aspect'], sort=False, observed=True).agg(['sum', 'count'])
+        aspect_means = by_aspect['sum'] * 20 / by_aspect['count']
+        language_counts = rows['language'].value_counts()
         
-        query_lower = query.lower().strip()
+        return {
+            # Average all ratings on a 0-10 scale
+            'overall_score': round(ratings.mean() * 2, 1),
+            'aspect_scores': {aspect: int(score) for aspect, score in aspect_means.items()},
+            'language_stats': {
+                lang: int(language_counts.get(lang, 0)) for lang in LANGUAGE_STATS_KEYS
+            }
+        }
+    
+    def _aggregate_from_totals(self, names: List[str]) -> Dict:
+        """Same aggregates as _aggregate_rows, read from the precomputed totals"""
+        rating_sum = rating_count = 0
+        by_aspect = {}
+        language_counts = {}
+        
+        # A product may have no rows with an aspect or language
+        for name in names:
+            total, count = self._product_totals.get(name, (0, 0))
+            rating_sum += total
+            rating_count += count
+            
+            for aspect, (total, count) in self._aspect_totals.get(name, {}).items():
+                running = by_aspect.setdefault(aspect, [0, 0])
+                running[0] += total
+                running[1] += count
+            
+            for language, count in self._language_counts.get(name, {}).items():
+                language_counts[language] = language_counts.get(language, 0) + count
         
-        # Filter by category if specified
-        if category:
-            df_filtered = self.df[self.df['category'] == category]
-        else:
-            df_filtered = self.df
+        return {
+            'overall_score': round(rating_sum / rating_count * 2, 1),
+            'aspect_scores': {
+                aspect: int(total * 20 / count) for aspect, (total, count) in by_aspect.items()
+            },
+            'language_stats': {
+                lang: language_counts.get(lang, 0) for lang in LANGUAGE_STATS_KEYS
+            }
+        }
+    
+    def get_aspect_scores(self, product_name: str) -> Dict[str, int]:
+        """Calculate aspect scores from reviews"""
+        summary = self.get_product_summary(product_name)
+        return dict(summary['aspect_scores']) if summary else {}
+    
+    def get_product_data(self, product_name: str) -> Optional[Dict]:
+        """Get complete product data including reviews and scores"""
+        summary = self.get_product_summary(product_name)
         
-        # Find matching products
-        mask = df_filtered['product_name'].str.lower().str.contains(query_lower, na=False)
-        products = df_filtered[mask]['product_name'].unique().tolist()
+        if not summary:
+            return None
+        
+        reviews = self.get_product_reviews(product_name)
         
-        return products
+        return {
+            'product_name': product_name,
+            'category': summary['category'],
+            'reviews': reviews,
+            'aspect_scores': dict(summary['aspect_scores']),
+            'total_reviews': summary['total_reviews']
+        }
+    
+    def search_products(self, query: str, category: Optional[str] = None,
+                        limit: Optional[int] = None) -> List[str]:
+        """Search for products by name, best matches first (prefix and typo tolerant)"""
+        with self._data_lock:
+            return self._search_index.search(query, category, limit)
     
     def get_all_products(self, category: Optional[str] = None) -> List[str]:
         """Get all available products"""
-        if self.df is None or self.df.empty:
-            return []
+        with self._data_lock:
+            catalog = self._get_catalog()
+        products = catalog['product_name']
         
         if category:
-            products = self.df[self.df['category'] == category]['product_name'].unique()
-        else:
-            products = self.df['product_name'].unique()
+            products = products[catalog['category'] == category]
         
-        return sorted(products.tolist())
+        return sorted(products.unique().tolist())
     
     def get_categories(self) -> List[str]:
         """Get all available categories"""
-        if self.df is None or self.df.empty:
-            return []
-        
-        return sorted(self.df['category'].unique().tolist())
+        with self._data_lock:
+            catalog = self._get_catalog()
+        return sorted(catalog['category'].unique().tolist())
     
     def get_language_stats(self, product_name: str) -> Dict[str, int]:
         """Get review count by language for a product"""
-        reviews = self.get_product_reviews(product_name)
-        
-        stats = {'hindi': 0, 'marathi': 0}
-        
-        for review in reviews:
-            lang = review.get('language', 'hindi')
-            if lang in stats:
-                stats[lang] += 1
-        
-        return stats
+        summary = self.get_product_summary(product_name)
+        return dict(summary['language_stats']) if summary else dict.fromkeys(LANGUAGE_STATS_KEYS, 0)
     
     def get_overall_score(self, product_name: str) -> float:
         """Calculate overall product score"""
-        reviews = self.get_product_reviews(product_name)
-        
-        if not reviews:
-            return 0.0
-        
-        # Average all ratings
-        ratings = [r['rating'] for r in reviews]
-        avg_rating = np.mean(ratings)
-        
-        # Convert to 0-10 scale
-        return round(avg_rating * 2, 1)
+        summary = self.get_product_summary(product_name)
+        return summary['overall_score'] if summary else 0.0
     
     def compare_products(self, product1: str, product2: str) -> Dict:
         """Compare two products side by side"""
@@ -219,4 +779,184 @@ class CSVDataLoader:
         else:
             comparison['winner'] = 'Tie'
         
-        return comparison
\ No newline at end of file
+        return comparison
+
+
+class StreamingCSVDataLoader(CSVDataLoader):
+    """CSVDataLoader for review files larger than RAM
+    
+    The CSV is read in chunks of chunk_size rows. Only the per-product
+    aggregates and the byte offset of every review are kept in memory;
+    review rows are read back from the file when they are requested.
+    """
+    
+    def __init__(self, csv_path='reviews_dataset.csv', summary_cache_size=SUMMARY_CACHE_SIZE,
+                 chunk_size=STREAMING_CHUNK_SIZE):
+        """Initialize streaming CSV data loader"""
+        self.chunk_size = chunk_size
+        self._header = b''
+        super().__init__(csv_path, summary_cache_size,
+                         precompute_aggregates=True, use_cache=False)
+    
+    def load_data(self):
+        """Scan the CSV once, keeping aggregates and row offsets only"""
+        self._file_signature = self._get_file_signature()
+        self._generation += 1
+        self.df = None
+        
+        try:
+            self._scan_file()
+            logger.info(f"✅ Indexed {self._row_count} reviews from {self.csv_path} "
+                        f"({len(self._product_index)} products)")
+        except FileNotFoundError:
+            logger.error(f"❌ CSV file not found: {self.csv_path}")
+            self._reset_index()
+        except Exception as e:
+            logger.error(f"❌ Error loading CSV: {e}")
+            self._reset_index()
+        
+        self.clear_summary_cache()
+    
+    def _reset_index(self):
+        """Forget everything learned from the file"""
+        self._row_count = 0
+        self._product_index = {}
+        self._product_totals = None
+        self._aspect_totals = None
+        self._language_counts = None
+        self._set_catalog(pd.DataFrame(columns=['product_name', 'category']))
+    
+    def _scan_file(self):
+        """Aggregate the CSV chunk by chunk and record each review's byte offset"""
+        self._reset_index()
+        row_offsets = {}
+        catalog_parts = []
+        self._product_totals, self._aspect_totals, self._language_counts = {}, {}, {}
+        
+        with open(self.csv_path, 'rb') as f:
+            self._header = f.readline()
+            
+            for offsets, chunk in self._iter_chunks(f, len(self._header)):
+                # Keep the offsets of the rows _clean_data keeps
+                offsets = offsets[pd.to_numeric(chunk['rating'], errors='coerce').notna().to_numpy()]
+                chunk = self._clean_data(chunk)
+                
+                if chunk.empty:
+                    continue
+                
+                names = chunk['product_name'].str.lower()
+                for name, rows in chunk.groupby(names, sort=False).indices.items():
+                    row_offsets.setdefault(name, []).append(offsets[rows])
+                
+                self._merge_totals(self._compute_totals(chunk))
+                catalog_parts.append(chunk[['product_name', 'category']].drop_duplicates())
+                self._row_count += len(chunk)
+        
+        if not self._row_count:
+            self._reset_index()
+            return
+        
+        self._product_index = {
+            name: [np.concatenate(parts)] for name, parts in row_offsets.items()
+        }
+        self._set_catalog(pd.concat(catalog_parts).drop_duplicates())
+    
+    def _iter_chunks(self, f, start_offset: int):
+        """Yield (byte offsets, parsed DataFrame) for every chunk_size records"""
+        offsets = []
+        records = []
+        
+        for offset, record in self._iter_records(f, start_offset):
+            offsets.append(offset)
+            records.append(record)
+            
+            if len(records) >= self.chunk_size:
+                yield np.array(offsets, dtype=np.int64), self._parse_records(records)
+                offsets = []
+                records = []
+        
+        if records:
+            yield np.array(offsets, dtype=np.int64), self._parse_records(records)
+    
+    @staticmethod
+    def _iter_records(f, offset: int):
+        """Yield (byte offset, raw bytes) of each CSV record, honouring quoted newlines"""
+        start = offset
+        parts = []
+        quotes = 0
+        
+        for line in f:
+            parts.append(line)
+            quotes += line.count(b'"')
+            offset += len(line)
+            
+            # A record ends once its quotes are balanced
+            if quotes % 2 == 0:
+                record = b''.join(parts)
+                if record.strip():
+                    yield start, record
+                start = offset
+                parts = []
+                quotes = 0
+        
+        if parts and b''.join(parts).strip():
+            yield start, b''.join(parts)
+    
+    def _persist_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Append rows to the CSV; returns their byte offsets"""
+        start = self._append_to_csv(df)
+        
+        with open(self.csv_path, 'rb') as f:
+            if not self._header:
+                self._header = f.readline()
+                start = max(start, len(self._header))
+            f.seek(start)
+            offsets = [offset for offset, _ in self._iter_records(f, start)]
+        
+        self._row_count += len(df)
+        return np.array(offsets, dtype=np.int64)
+    
+    def _parse_records(self, records: List[bytes]) -> pd.DataFrame:
+        """Parse raw CSV records with the file's header"""
+        data = self._header + b''.join(
+            record if record.endswith(b'\n') else record + b'\n' for record in records
+        )
+        return pd.read_csv(io.BytesIO(data), encoding='utf-8')
+    
+    def _read_rows(self, positions: np.ndarray) -> pd.DataFrame:
+        """Read the reviews at the given byte offsets back from the CSV"""
+        if not len(positions):
+            return pd.DataFrame(columns=['product_name', 'category'] + REVIEW_FIELDS)
+        
+        records = []
+        with open(self.csv_path, 'rb') as f:
+            for offset in positions:
+                f.seek(offset)
+                records.append(next(self._iter_records(f, offset))[1])
+        
+        # Rows of scraped CSVs get their aspect labelled here, as during the scan
+        df = self._clean_data(self._parse_records(records))
+        df['rating'] = df['rating'].astype(np.int64)
+        return df
+    
+    def memory_report(self) -> Dict[str, int]:
+        """Print in-memory bytes of the offset index and aggregates"""
+        report = {
+            'row_offsets': sum(
+                offsets.nbytes for chunks in self._product_index.values() for offsets in chunks
+            ),
+            'product_totals': 0,
+            'aspect_totals': 0,
+            'language_counts': 0,
+            'catalog': int(self._get_catalog().memory_usage(deep=True).sum())
+        }
+        if self._aspect_totals is not None:
+            report['product_totals'] = _deep_size(self._product_totals)
+            report['aspect_totals'] = _deep_size(self._aspect_totals)
+            report['language_counts'] = _deep_size(self._language_counts)
+        
+        for name, size in report.items():
+            print(f"{name:<36} {size:>12,} bytes")
+        print(f"{'total':<36} {sum(report.values()):>12,} bytes")
+        
+        return report
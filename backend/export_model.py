@@ -0,0 +1,87 @@
+"""
+export_model.py - Export the trained model to ONNX and check backend accuracy parity
+
+Usage:
+    python export_model.py                 # export next to MODEL_PATH, then check parity
+    python export_model.py --skip-export   # only compare the backends
+
+Needs the optional ONNX packages: pip install -r requirements-onnx.txt
+"""
+import argparse
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+
+from inference_backends import BACKENDS, export_onnx
+from models import MODEL_PATH, SENTIMENT_LABELS, SentimentAnalyzer
+
+logging.basicConfig(level=logging.INFO)
+
+PARITY_DATASET = '../datasets/product_reviews.csv'
+MAX_ACCURACY_DROP = 0.01  # allowed accuracy loss of a faster backend vs torch
+
+
+def score_backend(model_path, backend, texts):
+    """Class predictions, positive scores and throughput of one backend"""
+    analyzer = SentimentAnalyzer(model_path, cache_path=None, allow_fallback=False, backend=backend)
+    analyzer.warmup()
+
+    results = analyzer.predict_batch(texts, verbose=False)
+    probabilities = np.array([
+        [result['probabilities'][label] for label in SENTIMENT_LABELS] for result in results
+    ])
+
+    return probabilities.argmax(axis=1), probabilities[:, 2], analyzer.last_batch_stats['texts_per_sec']
+
+
+def check_parity(model_path, dataset=PARITY_DATASET, max_drop=MAX_ACCURACY_DROP):
+    """Compare every backend with fp32 torch; returns False if one loses too much accuracy"""
+    df = pd.read_csv(dataset)
+    texts = df['text'].astype(str).tolist()
+    labels = df['sentiment'].map({label: i for i, label in enumerate(SENTIMENT_LABELS)}).to_numpy()
+
+    print(f"\n🧪 Backend parity on {len(texts)} reviews from {dataset}\n")
+    print(f"{'backend':<10} {'accuracy':>9} {'agreement':>10} {'max |Δscore|':>13} {'texts/sec':>10}")
+
+    baseline_preds, baseline_scores, _ = score_backend(model_path, 'torch', texts)
+    baseline_accuracy = (baseline_preds == labels).mean()
+    passed = True
+
+    for backend in BACKENDS:
+        preds, scores, throughput = score_backend(model_path, backend, texts)
+        accuracy = (preds == labels).mean()
+        agreement = (preds == baseline_preds).mean()
+        max_diff = np.abs(scores - baseline_scores).max()
+
+        ok = accuracy >= baseline_accuracy - max_drop
+        passed &= ok
+        print(f"{backend:<10} {accuracy:>9.2%} {agreement:>10.2%} {max_diff:>13.4f} "
+              f"{throughput:>10.1f} {'✅' if ok else '❌'}")
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=MODEL_PATH, help='trained model directory')
+    parser.add_argument('--dataset', default=PARITY_DATASET, help='labelled CSV (text, sentiment)')
+    parser.add_argument('--skip-export', action='store_true', help='reuse the existing ONNX export')
+    parser.add_argument('--max-drop', type=float, default=MAX_ACCURACY_DROP,
+                        help='allowed accuracy loss vs torch')
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        print(f"📦 Exporting {args.model} to ONNX...")
+        print(f"✅ Saved {export_onnx(args.model)}")
+
+    if not check_parity(args.model, args.dataset, args.max_drop):
+        print("\n❌ A backend lost more accuracy than allowed")
+        sys.exit(1)
+
+    print("\n🎉 All backends within tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -279,8 +279,9 @@ def main():
     else:
         combined_df = new_df
     
-    # Save to CSV
-    combined_df.to_csv('reviews_dataset.csv', index=False, encoding='utf-8')
+    # Append to CSV (append-only, the existing rows are not rewritten)
+    new_df.to_csv('reviews_dataset.csv', mode='a', header=existing_df.empty,
+                  index=False, encoding='utf-8')
     
     print(f"✅ Added {len(new_reviews)} new reviews")
     print(f"📊 Total reviews: {len(combined_df)}")
@@ -0,0 +1,129 @@
+"""
+inference_backends.py - Quantized PyTorch and ONNX Runtime variants of the sentiment model
+"""
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers.modeling_outputs import SequenceClassifierOutput
+
+try:
+    import onnx
+    import onnxruntime as ort
+except ImportError:  # only needed for the 'onnx' backend
+    onnx = None
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+# 'torch': fp32 eager PyTorch
+# 'quantized': PyTorch with dynamic int8 quantization of the Linear layers (CPU only)
+# 'onnx': exported graph run by ONNX Runtime with graph optimizations
+BACKENDS = ['torch', 'quantized', 'onnx']
+
+ONNX_FILE = 'model.onnx'
+ONNX_OPSET = 14
+ONNX_INPUTS = ['input_ids', 'attention_mask']
+
+
+def onnx_model_dir(model_path: str) -> str:
+    """Directory the ONNX export of model_path is written to (a sibling of it)"""
+    return f"{os.path.normpath(model_path)}_onnx"
+
+
+def quantize_dynamic(model: torch.nn.Module) -> torch.nn.Module:
+    """int8 weights for every Linear layer; activations are quantized on the fly"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _require_onnxruntime():
+    if onnx is None or ort is None:
+        raise ImportError("The 'onnx' backend needs onnx and onnxruntime (pip install -r requirements-onnx.txt)")
+
+
+class OnnxSequenceClassifier:
+    """Stand-in for the PyTorch model that runs an ONNX Runtime session
+
+    Called like the PyTorch model (keyword tensors in, output with .logits
+    out), so SentimentAnalyzer does not need to know which backend it has.
+    """
+
+    def __init__(self, onnx_path: str, num_threads: Optional[int] = None):
+        _require_onnxruntime()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Follow torch.set_num_threads so processes pinned to a few cores do not oversubscribe
+        options.intra_op_num_threads = num_threads or torch.get_num_threads()
+
+        self.session = ort.InferenceSession(
+            onnx_path, options, providers=['CPUExecutionProvider']
+        )
+        self._input_names = [node.name for node in self.session.get_inputs()]
+
+    def __call__(self, **inputs) -> SequenceClassifierOutput:
+        feed = {
+            name: inputs[name].cpu().numpy().astype('int64') for name in self._input_names
+        }
+        logits = self.session.run(['logits'], feed)[0]
+        return SequenceClassifierOutput(logits=torch.from_numpy(logits))
+
+    def to(self, device):
+        """ONNX Runtime sessions here always run on CPU"""
+        return self
+
+    def eval(self):
+        return self
+
+
+def export_onnx(model_path: str, output_dir: Optional[str] = None) -> str:
+    """Export model_path to ONNX, optimize the graph and save it with the tokenizer"""
+    _require_onnxruntime()
+    output_dir = output_dir or onnx_model_dir(model_path)
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    sample = tokenizer(["sample review", "दूसरा नमूना"], padding=True, return_tensors='pt')
+    onnx_path = os.path.join(output_dir, ONNX_FILE)
+
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in ONNX_INPUTS}
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_path = os.path.join(tmp_dir, 'model.raw.onnx')
+        inline_path = os.path.join(tmp_dir, 'model.inline.onnx')
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in ONNX_INPUTS),
+                raw_path,
+                input_names=ONNX_INPUTS,
+                output_names=['logits'],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET
+            )
+
+        # Exporters may spill weights to side files; keep a single self-contained graph
+        onnx.save(onnx.load(raw_path), inline_path)
+
+        # Save the graph after ONNX Runtime's hardware-independent optimizations
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        options.optimized_model_filepath = onnx_path
+        ort.InferenceSession(inline_path, options, providers=['CPUExecutionProvider'])
+
+    tokenizer.save_pretrained(output_dir)
+    shutil.copy(os.path.join(model_path, 'config.json'), output_dir)
+
+    logger.info(f"✅ Exported {model_path} to {onnx_path} in {time.perf_counter() - start:.1f}s")
+    return onnx_path
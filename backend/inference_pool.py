@@ -0,0 +1,252 @@
+"""
+inference_pool.py - Multi-process sentiment inference pinned to CPU core slices
+"""
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from inference_scheduler import MAX_BATCH_SIZE, MAX_WAIT_MS, InferenceScheduler
+from models import INFERENCE_BACKEND, MODEL_PATH
+
+logger = logging.getLogger(__name__)
+
+THREADS_PER_WORKER = 4  # cores given to each worker when num_workers is not set
+STARTUP_TIMEOUT = 300  # seconds to wait for every worker to load its model
+POLL_INTERVAL = 1.0  # seconds between worker health checks while idle
+
+
+def available_cores() -> List[int]:
+    """CPU ids this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def core_slices(num_workers: int, cores: Optional[List[int]] = None) -> List[List[int]]:
+    """Split cores into num_workers contiguous, near-equal slices"""
+    cores = cores or available_cores()
+
+    if num_workers >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(num_workers)]
+
+    size, extra = divmod(len(cores), num_workers)
+    slices, start = [], 0
+    for i in range(num_workers):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(cores[start:end])
+        start = end
+
+    return slices
+
+
+def _worker_main(worker_id, cores, model_path, backend, tasks, responses):
+    """Worker process: pin to cores, load the model once, score batches until told to stop"""
+    import torch
+    from models import SentimentAnalyzer
+
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cores)
+        torch.set_num_threads(len(cores))
+
+        # safetensors weights are memory-mapped, so every worker shares the same page-cache pages
+        analyzer = SentimentAnalyzer(
+            model_path, cache_path=None, device='cpu', allow_fallback=False, backend=backend
+        )
+        analyzer.warmup()
+    except Exception as e:
+        responses.put(('failed', worker_id, repr(e)))
+        return
+
+    responses.put(('ready', worker_id, None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+
+        batch_id, texts = task
+        start = time.perf_counter()
+        try:
+            results = analyzer.predict_batch(texts, batch_size=len(texts), verbose=False)
+        except Exception as e:
+            responses.put(('error', batch_id, repr(e)))
+        else:
+            responses.put(('done', batch_id, (results, time.perf_counter() - start)))
+
+
+class InferencePool(InferenceScheduler):
+    """InferenceScheduler whose batches run in a pool of worker processes
+
+    Each worker is pinned to its own slice of cores with a matching
+    torch.set_num_threads, so workers do not fight over cores or the GIL.
+    Batches are formed in this process exactly as in InferenceScheduler; a
+    new batch is only gathered once a worker is free, so batches grow while
+    the pool is busy.
+
+    Create it under ``if __name__ == '__main__':`` (or from an imported
+    module); workers are started with the 'spawn' method.
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, model_path=MODEL_PATH,
+                 backend=INFERENCE_BACKEND, cores: Optional[List[int]] = None,
+                 max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        """Start the workers and wait until each has loaded the model"""
+        cores = cores or available_cores()
+        num_workers = num_workers or max(1, len(cores) // THREADS_PER_WORKER)
+        self.core_slices = core_slices(num_workers, cores)
+
+        context = multiprocessing.get_context('spawn')
+        self._tasks = context.Queue()
+        self._responses = context.Queue()
+        self._slots = threading.Semaphore(num_workers)
+        self._in_flight: Dict[int, list] = {}
+        self._batch_ids = itertools.count()
+        self._stopping = False
+        self._broken: Optional[Exception] = None
+
+        start = time.perf_counter()
+        self._processes = [
+            context.Process(
+                target=_worker_main, name=f'inference-worker-{i}', daemon=True,
+                args=(i, worker_cores, model_path, backend, self._tasks, self._responses)
+            )
+            for i, worker_cores in enumerate(self.core_slices)
+        ]
+        for process in self._processes:
+            process.start()
+
+        try:
+            self._wait_until_ready()
+        except Exception:
+            self._terminate()
+            self._tasks.close()
+            self._responses.close()
+            raise
+
+        logger.info(f"✅ Inference pool ready: {num_workers} workers on cores {self.core_slices} "
+                    f"in {time.perf_counter() - start:.1f}s")
+
+        super().__init__(None, max_batch_size, max_wait_ms)
+
+        self._collector = threading.Thread(
+            target=self._collect, name='inference-pool-collector', daemon=True
+        )
+        self._collector.start()
+
+    def _wait_until_ready(self):
+        """Block until every worker reported that its model is loaded"""
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        waiting = set(range(len(self._processes)))
+
+        while waiting:
+            remaining = max(0, deadline - time.monotonic())
+            try:
+                kind, worker_id, error = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(f"Inference workers {sorted(waiting)} did not start in time")
+
+            if kind == 'failed':
+                raise RuntimeError(f"Inference worker {worker_id} failed to start: {error}")
+            waiting.discard(worker_id)
+
+    def _next_batch(self):
+        """Wait for a free worker before gathering, so batches fill up meanwhile"""
+        self._slots.acquire()
+        batch, stop = super()._next_batch()
+
+        if not batch:
+            self._slots.release()
+        return batch, stop
+
+    def _score(self, batch):
+        """Hand the batch to a worker; the collector thread resolves its futures"""
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch or self._broken:
+            for _, future in batch:
+                future.set_exception(self._broken)
+            self._slots.release()
+            return
+
+        batch_id = next(self._batch_ids)
+        self._in_flight[batch_id] = [future for _, future in batch]
+        self._tasks.put((batch_id, [text for text, _ in batch]))
+
+    def _collect(self):
+        """Resolve futures as workers finish batches; fail them if a worker dies"""
+        while True:
+            try:
+                kind, batch_id, payload = self._responses.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if self._stopping:
+                    return
+                if not all(process.is_alive() for process in self._processes):
+                    self._fail_in_flight(RuntimeError("An inference worker exited unexpectedly"))
+                    return
+                continue
+
+            futures = self._in_flight.pop(batch_id, [])
+            self._slots.release()
+
+            if kind == 'done':
+                results, elapsed = payload
+                self._record_batch(len(futures), elapsed)
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+            else:
+                logger.error(f"❌ Batch inference failed in worker: {payload}")
+                for future in futures:
+                    future.set_exception(RuntimeError(payload))
+
+    def _fail_in_flight(self, error: Exception):
+        """Fail every batch a worker was holding and refuse new texts"""
+        logger.error(f"❌ {error}")
+        self._broken = error
+        self._closed = True
+        for batch_id in list(self._in_flight):
+            for future in self._in_flight.pop(batch_id):
+                future.set_exception(error)
+            self._slots.release()
+
+    def close(self, timeout: Optional[float] = None):
+        """Score everything already queued, then stop the workers"""
+        super().close(timeout)
+
+        # Wait for the batches the workers are still scoring
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._in_flight and self._collector.is_alive():
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+
+        self._stopping = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout)
+        self._terminate()
+
+    def _terminate(self):
+        """Kill workers that are still running"""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+    def metrics(self) -> Dict:
+        """Scheduler metrics plus worker layout and batches in flight"""
+        metrics = super().metrics()
+        metrics['workers'] = len(self._processes)
+        metrics['core_slices'] = self.core_slices
+        metrics['batches_in_flight'] = len(self._in_flight)
+        return metrics
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
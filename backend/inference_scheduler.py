@@ -0,0 +1,145 @@
+"""
+inference_scheduler.py - Micro-batching queue in front of SentimentAnalyzer
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 32
+MAX_WAIT_MS = 5  # how long the first queued text waits for others to join its batch
+
+
+class InferenceScheduler:
+    """Collect texts from many threads and score them in shared forward passes
+
+    A single worker thread takes texts off the queue and flushes a batch when
+    it reaches max_batch_size or when the oldest text has waited max_wait_ms.
+    Each batch runs through analyzer.predict_batch() and resolves the futures
+    of the callers whose texts it contained.
+    """
+
+    def __init__(self, analyzer, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        """Start the worker thread for analyzer"""
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._texts_scored = 0
+        self._busy_seconds = 0.0
+        self._closed = False
+
+        self._worker = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text; the future resolves to its predict_batch() result dict"""
+        if self._closed:
+            raise RuntimeError("InferenceScheduler is closed")
+
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def predict(self, text: str, timeout: Optional[float] = None) -> float:
+        """Blocking drop-in for SentimentAnalyzer.predict()"""
+        return self.submit(text).result(timeout)['score']
+
+    async def predict_async(self, text: str) -> float:
+        """predict() for asyncio code; awaits without blocking the event loop"""
+        result = await asyncio.wrap_future(self.submit(text))
+        return result['score']
+
+    def close(self, timeout: Optional[float] = None):
+        """Score everything already queued, then stop the worker"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join(timeout)
+
+    def metrics(self) -> Dict:
+        """Queue depth and batch-size statistics since start"""
+        with self._metrics_lock:
+            batches = sum(self._batch_sizes.values())
+            return {
+                'queue_depth': self._queue.qsize(),
+                'batches': batches,
+                'texts_scored': self._texts_scored,
+                'avg_batch_size': round(self._texts_scored / batches, 2) if batches else 0.0,
+                'max_batch_size': max(self._batch_sizes, default=0),
+                'batch_size_histogram': dict(sorted(self._batch_sizes.items())),
+                'texts_per_sec': (
+                    round(self._texts_scored / self._busy_seconds, 1) if self._busy_seconds else 0.0
+                )
+            }
+
+    def _run(self):
+        """Worker loop: gather a batch, score it, repeat until closed"""
+        while True:
+            batch, stop = self._next_batch()
+
+            if batch:
+                self._score(batch)
+            if stop:
+                return
+
+    def _next_batch(self) -> Tuple[List[Tuple[str, Future]], bool]:
+        """Block for one text, then gather more until the batch is full or the wait expires"""
+        item = self._queue.get()
+        if item is None:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is None:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _score(self, batch: List[Tuple[str, Future]]):
+        """Run one forward pass for the batch and resolve its futures"""
+        # Skip callers that cancelled while queued
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            results = self.analyzer.predict_batch(
+                [text for text, _ in batch], batch_size=len(batch), verbose=False
+            )
+        except Exception as e:
+            logger.error(f"❌ Batch inference failed: {e}", exc_info=True)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self._record_batch(len(batch), time.perf_counter() - start)
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _record_batch(self, size: int, elapsed: float):
+        """Add one scored batch to the metrics"""
+        with self._metrics_lock:
+            self._batch_sizes[size] += 1
+            self._texts_scored += size
+            self._busy_seconds += elapsed
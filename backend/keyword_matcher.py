@@ -0,0 +1,169 @@
+"""
+keyword_matcher.py - Compiled multi-keyword substring matcher
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+_END = ''  # trie key marking the end of a keyword
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching any keyword, built from a trie so shared prefixes are tested once"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[_END] = True
+
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict) -> str:
+    """Pattern for one trie node; longer continuations are preferred over stopping here"""
+    branches = [
+        re.escape(char) + _node_pattern(child)
+        for char, child in sorted(node.items()) if char != _END
+    ]
+
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f"(?:{body})?" if _END in node else body
+
+
+class KeywordMatcher:
+    """Finds which of many keywords occur in a text with a single regex scan
+
+    The keywords are compiled into one trie-shaped alternation, so shared
+    prefixes are tested once and the regex engine can skip ahead to
+    characters that start a keyword. Matching resumes one character after
+    each match start, so overlapping keywords are found too: at every start
+    position the longest keyword is reported, and keywords that are prefixes
+    of it are added back. find() therefore returns exactly the keywords k
+    with ``k in text``, however many keywords there are. Texts and keywords
+    are lowercased.
+    """
+
+    def __init__(self, keywords: Union[Mapping[str, Iterable[str]], Iterable[str]]):
+        """keywords: keyword -> labels (e.g. aspects), or a plain list of keywords"""
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: () for keyword in keywords}
+
+        labels: Dict[str, Set[str]] = {}
+        for keyword, keyword_labels in keywords.items():
+            keyword = keyword.lower()
+            if keyword:
+                labels.setdefault(keyword, set()).update(keyword_labels)
+
+        # A match implies every keyword that is a prefix of it
+        implied = {
+            keyword: tuple(keyword[:i] for i in range(1, len(keyword) + 1) if keyword[:i] in labels)
+            for keyword in labels
+        }
+
+        self._set_state(
+            {keyword: tuple(sorted(values)) for keyword, values in labels.items()},
+            implied,
+            _trie_pattern(labels) if labels else None
+        )
+
+    def _set_state(self, labels: Dict[str, Tuple[str, ...]], implied: Dict[str, Tuple[str, ...]],
+                   pattern: Optional[str]):
+        self.labels = labels
+        self.keywords_by_label: Dict[str, List[str]] = {}
+        for keyword, keyword_labels in self.labels.items():
+            for label in keyword_labels:
+                self.keywords_by_label.setdefault(label, []).append(keyword)
+
+        self._implied = implied
+        self.pattern = re.compile(pattern) if pattern is not None else None
+
+    def to_state(self) -> Dict:
+        """JSON-serializable compiled form; from_state() rebuilds the matcher without the trie"""
+        return {
+            'labels': {keyword: list(values) for keyword, values in self.labels.items()},
+            'implied': {keyword: list(values) for keyword, values in self._implied.items()},
+            'pattern': self.pattern.pattern if self.pattern is not None else None
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping) -> 'KeywordMatcher':
+        matcher = cls.__new__(cls)
+        matcher._set_state(
+            {keyword: tuple(values) for keyword, values in state['labels'].items()},
+            {keyword: tuple(values) for keyword, values in state['implied'].items()},
+            state['pattern']
+        )
+        return matcher
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _scan(self, text_lower: str) -> Iterator[re.Match]:
+        """Longest match at every position where a keyword starts"""
+        if self.pattern is None:
+            return
+
+        search = self.pattern.search
+        match = search(text_lower)
+        while match is not None:
+            yield match
+            match = search(text_lower, match.start() + 1)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """(start, end, keyword) of the longest keyword starting at each position"""
+        for match in self._scan(text.lower()):
+            yield match.start(), match.end(), match.group()
+
+    def finditer_all(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """(start, end, keyword) of every keyword occurrence, shorter overlapping ones included"""
+        for match in self._scan(text.lower()):
+            start = match.start()
+            for keyword in self._implied[match.group()]:
+                yield start, start + len(keyword), keyword
+
+    def find(self, text: str) -> Set[str]:
+        """Every keyword that occurs in text"""
+        found = set()
+        for match in self._scan(text.lower()):
+            found.update(self._implied[match.group()])
+        return found
+
+    def label_counts(self, text: str) -> Counter:
+        """label -> number of distinct keywords with that label in text"""
+        return Counter(label for keyword in self.find(text) for label in self.labels[keyword])
+
+    def find_frame(self, texts: pd.Series) -> pd.DataFrame:
+        """find() over a Series: one row per (row position in texts, distinct keyword found)"""
+        rows, keywords = [], []
+
+        for row, text in enumerate(texts.fillna('').astype(str).str.lower()):
+            found = set()
+            for match in self._scan(text):
+                found.update(self._implied[match.group()])
+
+            rows.extend([row] * len(found))
+            keywords.extend(found)
+
+        return pd.DataFrame({
+            'row': np.array(rows, dtype='int64'),
+            'keyword': pd.Series(keywords, dtype=object)
+        })
+
+    def label_counts_frame(self, texts: pd.Series, labels: List[str]) -> pd.DataFrame:
+        """Vectorized label_counts(): one row per text (same index), one column per label"""
+        found = self.find_frame(texts)
+
+        return pd.DataFrame({
+            label: np.bincount(
+                found['row'][found['keyword'].isin(self.keywords_by_label.get(label, []))],
+                minlength=len(texts)
+            )
+            for label in labels
+        }, index=texts.index)
@@ -0,0 +1,154 @@
+"""
+model_registry.py - Process-wide registry of loaded sentiment models
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from inference_backends import (
+    BACKENDS, ONNX_FILE, OnnxSequenceClassifier, onnx_model_dir, quantize_dynamic
+)
+
+logger = logging.getLogger(__name__)
+
+NUM_LABELS = 3  # negative, neutral, positive
+
+# Weight files save_pretrained() may write, preferred first
+SAFETENSORS_FILES = ['model.safetensors', 'model.safetensors.index.json']
+PICKLE_FILES = ['pytorch_model.bin', 'pytorch_model.bin.index.json']
+
+
+class LoadedModel(NamedTuple):
+    tokenizer: object
+    model: torch.nn.Module
+    device: torch.device
+
+
+def default_device() -> torch.device:
+    """GPU when available, otherwise CPU"""
+    return torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+
+def weights_file(model_path: str) -> Optional[str]:
+    """Weight file in a local model directory (None for hub names or empty dirs)"""
+    for name in SAFETENSORS_FILES + PICKLE_FILES:
+        if os.path.isfile(os.path.join(model_path, name)):
+            return name
+    return None
+
+
+class ModelRegistry:
+    """Loads each (model path, device, backend) once and hands out the shared copy
+
+    Loading is lazy and thread-safe: concurrent callers asking for the same
+    model wait for a single load, while different models load in parallel.
+    A failed load is not remembered, so the next caller retries.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str, str], LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+
+    def get(self, model_path: str, device: Optional[torch.device] = None,
+            backend: str = 'torch') -> LoadedModel:
+        """Tokenizer, model and device for model_path, loading them on first use
+
+        backend: 'torch', 'quantized' or 'onnx' (see inference_backends); the
+        last two run on CPU only
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r} (expected one of {BACKENDS})")
+
+        if backend == 'torch':
+            device = torch.device(device) if device is not None else default_device()
+        else:
+            device = torch.device(device if device is not None else 'cpu')
+            if device.type != 'cpu':
+                raise ValueError(f"The {backend!r} backend runs on CPU only")
+
+        key = (model_path, str(device), backend)
+
+        loaded = self._models.get(key)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            loaded = self._models.get(key)
+            if loaded is None:
+                loaded = self._load(model_path, device, backend)
+                self._models[key] = loaded
+
+        return loaded
+
+    @staticmethod
+    def _load(model_path: str, device: torch.device, backend: str) -> LoadedModel:
+        """Read tokenizer and weights and move the model to device"""
+        start = time.perf_counter()
+
+        if backend == 'onnx':
+            onnx_dir = onnx_model_dir(model_path)
+            onnx_path = os.path.join(onnx_dir, ONNX_FILE)
+            if not os.path.isfile(onnx_path):
+                raise FileNotFoundError(
+                    f"No ONNX export at {os.path.abspath(onnx_path)} (run export_model.py first)"
+                )
+
+            tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+            model = OnnxSequenceClassifier(onnx_path)
+            source = os.path.abspath(onnx_path)
+        else:
+            weights = weights_file(model_path)
+            safetensors = weights in SAFETENSORS_FILES
+
+            if os.path.isdir(model_path):
+                source = f"{os.path.abspath(model_path)}/{weights}"
+            elif os.path.isabs(model_path) or model_path.startswith('.'):
+                raise FileNotFoundError(
+                    f"No trained model at {os.path.abspath(model_path)} (run train_model.py first)"
+                )
+            else:
+                source = f"hub model {model_path} (not fine-tuned)"
+
+            if weights in PICKLE_FILES:
+                logger.warning(
+                    f"⚠️ {model_path} has pickled weights ({weights}); re-save it with "
+                    f"safe_serialization=True so processes can share memory-mapped weights"
+                )
+
+            tokenizer = AutoTokenizer.from_pretrained(model_path)
+            # safetensors files are memory-mapped, so processes on one host share their pages
+            model = AutoModelForSequenceClassification.from_pretrained(
+                model_path, num_labels=NUM_LABELS, use_safetensors=True if safetensors else None
+            )
+            model.eval()
+
+            if backend == 'quantized':
+                model = quantize_dynamic(model)
+            model.to(device)
+
+        logger.info(f"✅ Loaded sentiment model from {source} ({backend}) on {device} "
+                    f"in {time.perf_counter() - start:.1f}s")
+        return LoadedModel(tokenizer, model, device)
+
+    def loaded(self):
+        """(model path, device, backend) entries currently held"""
+        return list(self._models)
+
+    def clear(self):
+        """Forget every loaded model (they are freed once no component uses them)"""
+        with self._lock:
+            self._models.clear()
+            self._load_locks.clear()
+
+
+# Shared by every SentimentAnalyzer / AspectClassifier in the process
+model_registry = ModelRegistry()
@@ -1,26 +1,146 @@
+import functools
+import json
+import logging
+import os
+import sys
+import time
+
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
+import pandas as pd
+
+from aspect_extractor import get_extractor
+from inference_backends import onnx_model_dir
+from keyword_matcher import KeywordMatcher
+from model_registry import model_registry
+from prediction_cache import PREDICTION_CACHE_PATH, PredictionCache, model_fingerprint
+
+# config.py sits at the repository root, one level above backend/ where the
+# app is started, so it is not on the import path by default
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+try:
+    from config import MODEL_PATH, INFERENCE_BACKEND
+    SETTINGS_SOURCE = os.path.join(REPO_ROOT, 'config.py')
+except ImportError:
+    MODEL_PATH = './trained_model'  # where train_model.py saves the fine-tuned model
+    INFERENCE_BACKEND = 'torch'
+    SETTINGS_SOURCE = 'built-in defaults (config.py not found)'
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_LABELS = ['negative', 'neutral', 'positive']
+DEFAULT_BATCH_SIZE = 32
+WINDOW_MAX_LENGTH = 128  # tokens per forward-pass window; most reviews fit in one
+WINDOW_STRIDE = 32  # tokens shared by consecutive windows of a long review
+WINDOW_AGGREGATIONS = ['mean', 'max']
+WARMUP_TEXT = "कैमरा बहुत बढ़िया है but battery is poor"
+LEXICON_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'data', 'sentiment_lexicon.json'
+)
+
+
+class SentimentLexicon:
+    """Positive/negative keywords behind the rule-based backup, compiled into one matcher"""
+    
+    def __init__(self, path=LEXICON_PATH):
+        """Load {polarity: {language: [words]}} from a JSON file"""
+        with open(path, encoding='utf-8') as f:
+            lexicon = json.load(f)
+        
+        keywords = {}
+        for polarity, languages in lexicon.items():
+            for words in languages.values():
+                for word in words:
+                    keywords.setdefault(word, []).append(polarity)
+        
+        self.matcher = KeywordMatcher(keywords)
+        self._positive = frozenset(self.matcher.keywords_by_label.get('positive', []))
+        self._negative = frozenset(self.matcher.keywords_by_label.get('negative', []))
+    
+    @staticmethod
+    def _score(pos_count, neg_count):
+        if pos_count > neg_count:
+            return 0.8
+        elif neg_count > pos_count:
+            return 0.2
+        else:
+            return 0.5
+    
+    def score(self, text):
+        """0.8 if more distinct positive than negative words occur, 0.2 if fewer, else 0.5"""
+        found = self.matcher.find(text)
+        return self._score(len(found & self._positive), len(found & self._negative))
+    
+    def score_series(self, texts):
+        """score() for a whole pandas Series of texts at once"""
+        counts = self.matcher.label_counts_frame(texts, ['positive', 'negative'])
+        pos_count, neg_count = counts['positive'], counts['negative']
+        return pd.Series(
+            np.select([pos_count > neg_count, neg_count > pos_count], [0.8, 0.2], 0.5),
+            index=texts.index
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def load_lexicon(path=LEXICON_PATH):
+    """SentimentLexicon for path, compiled once per process"""
+    return SentimentLexicon(path)
+
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize multilingual sentiment model"""
-        # Using XLM-RoBERTa for multilingual support
-        model_name = "xlm-roberta-base"
+    def __init__(self, model_path=MODEL_PATH, cache_path=PREDICTION_CACHE_PATH, device=None,
+                 allow_fallback=True, backend=INFERENCE_BACKEND, lexicon_path=LEXICON_PATH,
+                 max_length=WINDOW_MAX_LENGTH, stride=WINDOW_STRIDE, aggregate='mean'):
+        """
+        Initialize multilingual sentiment model
+        model_path: fine-tuned model directory (config.MODEL_PATH) or a hub model name
+        The model is loaded once per process and shared through model_registry
+        cache_path: SQLite file that keeps predictions across restarts (None = memory only)
+        allow_fallback: use the rule-based backup if the model cannot be loaded (else raise)
+        backend: 'torch', 'quantized' (int8, CPU) or 'onnx' (ONNX Runtime, see export_model.py)
+        lexicon_path: JSON lexicon used by the rule-based backup
+        max_length, stride: texts longer than max_length tokens are scored as overlapping
+        windows of max_length tokens sharing stride tokens, instead of being truncated
+        aggregate: how window scores combine per text, 'mean' (weighted by window length)
+        or 'max' (the most confident window)
+        """
+        if aggregate not in WINDOW_AGGREGATIONS:
+            raise ValueError(f"aggregate must be one of {WINDOW_AGGREGATIONS}, not {aggregate!r}")
+        
+        self.model_path = model_path
+        self.max_length = max_length
+        self.stride = stride
+        self.aggregate = aggregate
+        self.backend = backend
+        self.lexicon = load_lexicon(lexicon_path)
+        self.cache = None
+        self.fingerprint = None  # identifies model + settings; None for the rule-based backup
+        
+        logger.info(f"⚙️ Sentiment model {model_path} with the {backend} backend "
+                    f"(defaults MODEL_PATH={MODEL_PATH!r}, INFERENCE_BACKEND={INFERENCE_BACKEND!r} "
+                    f"from {SETTINGS_SOURCE})")
         
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                model_name,
-                num_labels=3  # negative, neutral, positive
-            )
-            self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-            self.model.to(self.device)
-            print(f"Model loaded successfully on {self.device}")
-        except:
-            print("Using simple rule-based classifier")
+            self.tokenizer, self.model, self.device = model_registry.get(model_path, device, backend)
+        except Exception as e:
+            if not allow_fallback:
+                raise
+            logger.error(f"❌ Could not load sentiment model from {model_path}: {e}")
+            logger.warning("⚠️ Using simple rule-based classifier; scores are only 0.2/0.5/0.8")
             self.tokenizer = None
             self.model = None
+            self.device = None
+        
+        # Only model predictions are cached; the rule-based backup is cheaper than a lookup
+        if self.model is not None:
+            # Backends and window settings change scores, so each has its own cache entries
+            weights_path = onnx_model_dir(model_path) if backend == 'onnx' else model_path
+            self.fingerprint = (f"{model_fingerprint(weights_path)}-{backend}"
+                                f"-{max_length}-{stride}-{aggregate}")
+            self.cache = PredictionCache(self.fingerprint, cache_path)
     
     def predict(self, text):
         """
@@ -31,70 +151,177 @@ class SentimentAnalyzer:
             # Simple rule-based backup
             return self._rule_based_sentiment(text)
         
-        try:
-            # Tokenize
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=512,
-                padding=True
-            )
-            
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Predict
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                probabilities = torch.softmax(outputs.logits, dim=1)
-            
-            # Convert to score
-            probs = probabilities.cpu().numpy()[0]
-            score = probs[2]  # positive probability
+        # Same windowing, cache and error handling as batches
+        return self.predict_batch([text], verbose=False)[0]['score']
+    
+    def predict_batch(self, texts, batch_size=DEFAULT_BATCH_SIZE, verbose=False):
+        """
+        Predict sentiment for many texts with batched forward passes
+        Long texts are split into overlapping windows that share batches with the short ones
+        Returns: one dict per text, in input order, with 'score' (as in predict)
+        and 'probabilities' (negative/neutral/positive, None for rule-based results)
+        verbose: log throughput (always recorded in last_batch_stats)
+        """
+        texts = list(texts)
+        start = time.perf_counter()
+        batches = 0
+        windows = 0
+        results = [None] * len(texts)
+        
+        # Repeated texts are scored once; cached ones are not scored at all
+        pending = {}
+        for i, text in enumerate(texts):
+            cached = self.cache.get(text) if self.cache else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+        
+        unique_texts = list(pending)
+        
+        if self.model is None:
+            scores = self.lexicon.score_series(pd.Series(unique_texts, dtype=object))
+            scored = [{'score': float(score), 'probabilities': None} for score in scores]
+        elif unique_texts:
+            scored, batches, windows = self._score_windows(unique_texts, batch_size)
+        else:
+            scored = []
+        
+        for text, result in zip(unique_texts, scored):
+            for i in pending[text]:
+                results[i] = dict(result)
+        
+        elapsed = time.perf_counter() - start
+        self.last_batch_stats = {
+            'texts': len(texts),
+            'scored': len(unique_texts),
+            'cached': len(texts) - sum(len(indices) for indices in pending.values()),
+            'windows': windows,
+            'batches': batches,
+            'batch_size': batch_size,
+            'seconds': elapsed,
+            'texts_per_sec': len(texts) / elapsed if elapsed > 0 else 0.0
+        }
+        if verbose:
+            logger.info(f"⏱️ Scored {len(texts)} texts in {elapsed:.2f}s "
+                        f"({self.last_batch_stats['texts_per_sec']:.1f} texts/sec, batch size {batch_size})")
+        
+        return results
+    
+    def _score_windows(self, texts, batch_size):
+        """
+        Score texts as token windows: one window for most, several overlapping ones for long texts
+        Returns: (results, number of batches, number of windows)
+        """
+        encodings = self.tokenizer(
+            texts, truncation=True, max_length=self.max_length, stride=self.stride,
+            return_overflowing_tokens=True
+        )
+        # Window i belongs to texts[owners[i]]
+        owners = encodings.pop('overflow_to_sample_mapping')
+        lengths = [sum(mask) for mask in encodings['attention_mask']]
+        
+        # Similar lengths share a batch, so each is padded only to its own longest window
+        order = sorted(range(len(owners)), key=lambda i: lengths[i])
+        window_probs = np.zeros((len(owners), len(SENTIMENT_LABELS)))
+        failed = set()
+        batches = 0
+        
+        for batch_start in range(0, len(order), batch_size):
+            batch = order[batch_start:batch_start + batch_size]
+            batches += 1
             
-            return float(score)
+            try:
+                window_probs[batch] = self._forward(
+                    {key: [encodings[key][i] for i in batch] for key in encodings.keys()}
+                )
+            except Exception as e:
+                print(f"Prediction error: {e}")
+                failed.update(owners[i] for i in batch)
         
-        except Exception as e:
-            print(f"Prediction error: {e}")
-            return self._rule_based_sentiment(text)
+        windows_by_text = [[] for _ in texts]
+        for window, owner in enumerate(owners):
+            windows_by_text[owner].append(window)
+        
+        results = []
+        for i, text in enumerate(texts):
+            if i in failed:
+                results.append(self._rule_based_result(text))
+            else:
+                windows = windows_by_text[i]
+                probs = self._aggregate_windows(window_probs[windows], [lengths[w] for w in windows])
+                results.append(self._model_result(probs))
+        
+        if self.cache:
+            self.cache.put_many(
+                (text, result) for i, (text, result) in enumerate(zip(texts, results)) if i not in failed
+            )
+        
+        return results, batches, len(owners)
     
-    def _rule_based_sentiment(self, text):
-        """Backup rule-based sentiment analysis"""
-        positive_words = [
-            'बढ़िया', 'अच्छा', 'शानदार', 'बेहतरीन', 'जबरदस्त', 'उत्तम',
-            'छान', 'सुंदर', 'perfect', 'best', 'good', 'great', 'excellent'
-        ]
-        negative_words = [
-            'खराब', 'बुरा', 'कम', 'नहीं', 'not', 'bad', 'poor', 'waste',
-            'वाया', 'गयाचा'
-        ]
+    def _aggregate_windows(self, probs, lengths):
+        """Combine the class probabilities of one text's windows"""
+        if len(probs) == 1:
+            return probs[0]
+        if self.aggregate == 'max':
+            # Window whose prediction is most confident
+            return probs[probs.max(axis=1).argmax()]
+        return np.average(probs, axis=0, weights=lengths)
+    
+    def _forward(self, features):
+        """Pad one batch of tokenized texts and return its class probabilities"""
+        inputs = self.tokenizer.pad(features, return_tensors="pt")
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
         
-        text_lower = text.lower()
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            probabilities = torch.softmax(outputs.logits, dim=1)
         
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+        return probabilities.cpu().numpy()
+    
+    @staticmethod
+    def _model_result(probs):
+        """predict_batch result for one row of class probabilities"""
+        return {
+            'score': float(probs[2]),
+            'probabilities': dict(zip(SENTIMENT_LABELS, map(float, probs)))
+        }
+    
+    def warmup(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Run a dummy batch so the first real request does not pay one-time setup costs"""
+        if self.model is None:
+            return
         
-        if pos_count > neg_count:
-            return 0.8
-        elif neg_count > pos_count:
-            return 0.2
-        else:
-            return 0.5
+        start = time.perf_counter()
+        features = self.tokenizer(
+            [WARMUP_TEXT] * batch_size, truncation=True, max_length=self.max_length
+        )
+        self._forward(dict(features))
+        logger.info(f"🔥 Warmup finished in {time.perf_counter() - start:.2f}s")
+    
+    def _rule_based_result(self, text):
+        """predict_batch result for a text scored by the rule-based backup"""
+        return {'score': self._rule_based_sentiment(text), 'probabilities': None}
+    
+    def _rule_based_sentiment(self, text):
+        """Backup rule-based sentiment analysis"""
+        return self.lexicon.score(text)
 
 
 class AspectClassifier:
     """Classify sentiment for specific aspects"""
     
-    def __init__(self):
-        self.sentiment_analyzer = SentimentAnalyzer()
+    def __init__(self, sentiment_analyzer=None, aspect_extractor=None):
+        # Reuses the process-wide model instead of loading another copy
+        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+        self.aspect_extractor = aspect_extractor or get_extractor()
     
     def classify_aspect_sentiment(self, text, aspect):
         """Get sentiment for a specific aspect in text"""
-        # Check if aspect is mentioned
-        if aspect.lower() not in text.lower():
+        # Only the sentences that mention the aspect are scored
+        sentences = self.aspect_extractor.get_aspect_sentences(text, aspect)
+        if not sentences:
             return None
         
-        # Get sentiment for the whole text
-        # In production: extract aspect-specific sentences
-        sentiment = self.sentiment_analyzer.predict(text)
-        return sentiment
\ No newline at end of file
+        results = self.sentiment_analyzer.predict_batch(sentences, verbose=False)
+        return float(np.mean([result['score'] for result in results]))
@@ -0,0 +1,207 @@
+"""
+prediction_cache.py - Two-tier (memory + SQLite) cache of sentiment predictions
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CACHE_SIZE = 10_000  # predictions kept in the in-process LRU
+PREDICTION_CACHE_PATH = 'prediction_cache.db'
+PROBABILITY_COLUMNS = ['negative', 'neutral', 'positive']  # models.SENTIMENT_LABELS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    score REAL NOT NULL,
+    negative REAL,
+    neutral REAL,
+    positive REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a review for cache lookups (NFC, collapsed whitespace)"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def model_fingerprint(model_path: str) -> str:
+    """Hash of the model files' names, sizes and mtimes (or of the hub name)"""
+    digest = hashlib.sha256(model_path.encode('utf-8'))
+
+    if os.path.isdir(model_path):
+        for root, dirs, files in os.walk(model_path):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entry = f"{os.path.relpath(path, model_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+                digest.update(entry.encode('utf-8'))
+
+    return digest.hexdigest()[:16]
+
+
+class PredictionCache:
+    """Content-addressed cache of predict_batch() results
+
+    Keys hash the normalized text together with the model fingerprint, so a
+    retrained model never sees stale scores. The SQLite tier survives
+    restarts and is emptied when it was written by a different model.
+    """
+
+    def __init__(self, fingerprint: str, path: Optional[str] = PREDICTION_CACHE_PATH,
+                 memory_size=MEMORY_CACHE_SIZE):
+        """Open the cache for one model; path=None keeps it in memory only"""
+        self.fingerprint = fingerprint
+        self.path = path
+        self.memory_size = memory_size
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path:
+            self._open_disk_tier()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+
+        return conn
+
+    def _open_disk_tier(self):
+        """Create the schema and drop predictions made by another model"""
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+
+        row = conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint:
+            with conn:
+                if row is not None:
+                    logger.info(f"🔄 Model changed, clearing prediction cache {self.path}")
+                conn.execute('DELETE FROM predictions')
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)",
+                    (self.fingerprint,)
+                )
+
+    def key(self, text: str) -> str:
+        """Cache key of a text for the current model"""
+        payload = f"{self.fingerprint}\0{normalize_text(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, text: str) -> Optional[Dict]:
+        """Cached result for text, or None"""
+        key = self.key(text)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._to_result(entry)
+
+        if self.path:
+            row = self._connection().execute(
+                'SELECT score, negative, neutral, positive FROM predictions WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is not None:
+                entry = (row[0], None if row[1] is None else tuple(row[1:]))
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, entry)
+                return self._to_result(entry)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, text: str, result: Dict):
+        """Store a result dict ('score' and optional 'probabilities')"""
+        self.put_many([(text, result)])
+
+    def put_many(self, items):
+        """Store (text, result) pairs; one disk transaction for all of them"""
+        rows = []
+
+        with self._lock:
+            for text, result in items:
+                key = self.key(text)
+                probabilities = result.get('probabilities')
+                probs = None if probabilities is None else tuple(
+                    probabilities[label] for label in PROBABILITY_COLUMNS
+                )
+                self._remember(key, (result['score'], probs))
+                rows.append((key, result['score']) + (probs or (None, None, None)))
+
+        if self.path and rows:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO predictions (key, score, negative, neutral, positive) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    rows
+                )
+
+    def _remember(self, key: str, entry):
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _to_result(entry) -> Dict:
+        """Fresh result dict from a cache entry"""
+        score, probs = entry
+        return {
+            'score': score,
+            'probabilities': None if probs is None else dict(zip(PROBABILITY_COLUMNS, probs))
+        }
+
+    def clear(self):
+        """Drop every cached prediction (both tiers)"""
+        with self._lock:
+            self._memory.clear()
+
+        if self.path:
+            conn = self._connection()
+            with conn:
+                conn.execute('DELETE FROM predictions')
+
+    def stats(self) -> Dict:
+        """Hit/miss counters"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
@@ -1,53 +1,85 @@
+import multiprocessing
 import re
 import string
 
+import pandas as pd
+
+# URLs, mentions, hashtags and anything that is not a word character,
+# whitespace or Devanagari (emojis, punctuation) - removed in one pass
+CLEAN_PATTERN = re.compile(r'http\S+|www\S+|@\w+|#\w+|[^\w\s\u0900-\u097F]')
+
+# Nukta consonants folded into the plain ones, precomposed (क़) or written
+# as consonant + nukta (क + ़)
+NUKTA_CONSONANTS = 'कखगजफ'
+NORMALIZATION_TABLE = str.maketrans({
+    '\u0958': 'क', '\u0959': 'ख', '\u095a': 'ग', '\u095b': 'ज', '\u095e': 'फ'
+})
+NUKTA_PATTERN = re.compile(f'([{NUKTA_CONSONANTS}])\u093c')
+# Most texts contain neither form; they are returned after this one scan
+NUKTA_CHECK = re.compile('[\u093c\u0958-\u095b\u095e]')
+
+BATCH_CHUNK_SIZE = 10000  # texts per task when cleaning runs in worker processes
+
+_worker_preprocessor = None
+
+
+def _init_worker(preprocessor):
+    global _worker_preprocessor
+    _worker_preprocessor = preprocessor
+
+
+def _clean_chunk(texts):
+    return [_worker_preprocessor.clean_text(text) for text in texts]
+
 class TextPreprocessor:
     def __init__(self):
-        self.hindi_stopwords = [
+        self.hindi_stopwords = frozenset([
             'का', 'के', 'की', 'है', 'हैं', 'था', 'थी', 'थे', 'हो',
             'और', 'या', 'में', 'से', 'को', 'पर', 'यह', 'वह'
-        ]
+        ])
         
-        self.marathi_stopwords = [
+        self.marathi_stopwords = frozenset([
             'आहे', 'आहेत', 'होते', 'होता', 'आणि', 'किंवा', 'मध्ये',
             'पासून', 'साठी', 'वर', 'हे', 'ते'
-        ]
+        ])
     
     def clean_text(self, text):
         """Clean and normalize text"""
         if not text:
             return ""
         
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+', '', text)
-        
-        # Remove mentions and hashtags
-        text = re.sub(r'@\w+|#\w+', '', text)
+        # Remove URLs, mentions, hashtags and emojis, then collapse whitespace
+        return ' '.join(CLEAN_PATTERN.sub('', text).split())
+    
+    def clean_batch(self, texts, workers=None, chunk_size=BATCH_CHUNK_SIZE):
+        """clean_text() over a Series (returns a Series with the same index) or an iterable (a list)
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        workers: clean chunks of chunk_size texts in that many processes
+        (None runs in this process).
+        """
+        is_series = isinstance(texts, pd.Series)
+        values = texts.fillna('').astype(str).tolist() if is_series else list(texts)
         
-        # Remove emojis (optional)
-        text = re.sub(r'[^\w\s\u0900-\u097F]', '', text)
+        if workers and workers > 1 and len(values) > chunk_size:
+            chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+                cleaned = [text for chunk in pool.map(_clean_chunk, chunks) for text in chunk]
+        else:
+            cleaned = [self.clean_text(text) for text in values]
         
-        return text.strip()
+        return pd.Series(cleaned, index=texts.index, name=texts.name) if is_series else cleaned
     
     def remove_stopwords(self, text, language='hindi'):
         """Remove stopwords"""
         stopwords = self.hindi_stopwords if language == 'hindi' else self.marathi_stopwords
-        words = text.split()
-        filtered = [word for word in words if word not in stopwords]
-        return ' '.join(filtered)
+        return ' '.join(word for word in text.split() if word not in stopwords)
     
     def normalize_text(self, text):
         """Normalize unicode and variations"""
         # Normalize variations of similar characters
-        replacements = {
-            'क़': 'क', 'ख़': 'ख', 'ग़': 'ग',
-            'ज़': 'ज', 'फ़': 'फ'
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+        if NUKTA_CHECK.search(text) is None:
+            return text
         
-        return text
\ No newline at end of file
+        text = text.translate(NORMALIZATION_TABLE)
+        return NUKTA_PATTERN.sub(r'\1', text)
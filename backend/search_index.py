@@ -0,0 +1,303 @@
+"""
+search_index.py - In-memory n-gram index for product name search
+"""
+import bisect
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FUZZY_THRESHOLD = 0.4  # share of the query's trigrams a name must contain
+GRAM_SIZE = 3  # length of the n-grams and longest prefix indexed
+WALK_CHUNK = 256  # posting entries converted to Python ints at a time while walking
+
+
+def _ngrams(text: str, n: int) -> set:
+    """All n-grams of text (the whole text when it is shorter than n)"""
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _word_trigrams(text: str) -> set:
+    """Trigrams of each word, padded so word starts and ends count too"""
+    grams = set()
+    for word in text.split():
+        grams |= _ngrams(f"  {word} ", 3)
+    return grams
+
+
+def _prefixes(text: str) -> List[str]:
+    """Prefixes of text up to GRAM_SIZE characters"""
+    return [text[:n] for n in range(1, min(GRAM_SIZE, len(text)) + 1)]
+
+
+def _word_prefixes(text: str) -> set:
+    """Prefixes of every word but the first, up to GRAM_SIZE characters"""
+    return {
+        prefix
+        for i in range(1, len(text)) if text[i - 1] == ' ' and text[i] != ' '
+        for prefix in _prefixes(text[i:])
+    }
+
+
+def _rank_key(name: str) -> Tuple[int, str]:
+    """Shorter names rank first, then alphabetically smaller ones"""
+    return len(name), name
+
+
+def _group(keys: List[str], ids: List[int]) -> Dict[str, np.ndarray]:
+    """key -> array of its ids, keeping the order the ids were given in"""
+    if not keys:
+        return {}
+
+    codes, uniques = pd.factorize(pd.Series(keys, dtype=object))
+    order = np.argsort(codes, kind='stable')
+    grouped = np.asarray(ids, dtype=np.intp)[order]
+    bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+    return dict(zip(uniques.tolist(), np.split(grouped, bounds)))
+
+
+def _walk(posting: np.ndarray) -> Iterator[int]:
+    """Ids of a posting as Python ints, converted a chunk at a time"""
+    for start in range(0, len(posting), WALK_CHUNK):
+        yield from posting[start:start + WALK_CHUNK].tolist()
+
+
+class ProductSearchIndex:
+    """Ranked, prefix-aware and typo-tolerant search over distinct product names
+
+    Matches are ranked exact name > name prefix > word prefix > substring,
+    shorter (then alphabetically smaller) names first within each tier.
+    Every posting is an id array kept in that name order, so a search walks
+    the tiers in rank order and stops as soon as the page is full instead of
+    scoring every name that contains the query. Names given to the
+    constructor get their ids in rank order, so postings are grouped in bulk
+    without sorting; names added later are inserted at their rank.
+
+    A category filter masks each posting with the category's membership
+    array before it is walked. Typo-tolerant matching is only used when
+    nothing contains the query.
+    """
+
+    def __init__(self, products: Iterable[Tuple[str, str]], fuzzy_threshold=FUZZY_THRESHOLD):
+        """Build the index from (product_name, category) pairs"""
+        self.fuzzy_threshold = fuzzy_threshold
+
+        categories = defaultdict(set)
+        for name, category in products:
+            product_categories = categories[name]
+            if category is not None:
+                product_categories.add(category)
+
+        self._names = sorted(categories, key=_rank_key)
+        self._names_lower = [name.lower().strip() for name in self._names]
+        self._ids = {name: product_id for product_id, name in enumerate(self._names)}
+        self._ranked_keys = [_rank_key(name) for name in self._names]
+        self._rank_positions = np.arange(len(self._names))  # rank of every id
+
+        self._in_category = {}  # category -> bool array over ids
+        for product_id, name in enumerate(self._names):
+            for category in categories[name]:
+                self._category_mask(category)[product_id] = True
+
+        self._exact = defaultdict(list)
+        for product_id, name_lower in enumerate(self._names_lower):
+            self._exact[name_lower].append(product_id)
+
+        # Collect (key, id) pairs per posting family, then group them at once
+        families = {family: ([], []) for family in ('prefix', 'word_prefix', 'trigram', 'fuzzy')}
+        for product_id, name_lower in enumerate(self._names_lower):
+            for family, keys in self._name_keys(name_lower).items():
+                family_keys, family_ids = families[family]
+                family_keys.extend(keys)
+                family_ids.extend([product_id] * len(keys))
+
+        self._prefix_index = _group(*families['prefix'])  # name prefix (1..3 chars)
+        self._word_prefix_index = _group(*families['word_prefix'])  # prefix of a later word
+        self._trigram_index = _group(*families['trigram'])  # trigram (whole name if shorter)
+        self._fuzzy_index = _group(*families['fuzzy'])  # padded word trigram, for typos
+
+        self._short_grams = defaultdict(set)  # 1-/2-gram -> trigram keys containing it
+        for gram in self._trigram_index:
+            self._register_short_grams(gram)
+
+    @staticmethod
+    def _name_keys(name_lower: str) -> Dict[str, List[str]]:
+        """Posting keys of a lowercase name per posting family"""
+        return {
+            'prefix': _prefixes(name_lower),
+            'word_prefix': list(_word_prefixes(name_lower)),
+            'trigram': list(_ngrams(name_lower, GRAM_SIZE)),
+            'fuzzy': list(_word_trigrams(name_lower))
+        }
+
+    def _register_short_grams(self, gram: str):
+        for n in range(1, min(len(gram) + 1, GRAM_SIZE)):
+            for short in _ngrams(gram, n):
+                self._short_grams[short].add(gram)
+
+    def _category_mask(self, category: str) -> np.ndarray:
+        mask = self._in_category.get(category)
+        if mask is None:
+            mask = self._in_category[category] = np.zeros(len(self._names), dtype=bool)
+        return mask
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name: str, category: Optional[str] = None):
+        """Add a product (or another category for a known product)"""
+        product_id = self._ids.get(name)
+
+        if product_id is None:
+            product_id = self._insert_name(name)
+
+        if category is not None:
+            self._category_mask(category)[product_id] = True
+
+    def _insert_name(self, name: str) -> int:
+        """Give a new name the next id and insert it into every posting at its rank"""
+        product_id = len(self._names)
+        name_lower = name.lower().strip()
+
+        self._ids[name] = product_id
+        self._names.append(name)
+        self._names_lower.append(name_lower)
+
+        # Names ranked after the new one move down by one
+        key = _rank_key(name)
+        rank = bisect.bisect_left(self._ranked_keys, key)
+        self._ranked_keys.insert(rank, key)
+        self._rank_positions[self._rank_positions >= rank] += 1
+        self._rank_positions = np.append(self._rank_positions, rank)
+        for category, mask in self._in_category.items():
+            self._in_category[category] = np.append(mask, False)
+
+        self._exact[name_lower].append(product_id)
+        self._exact[name_lower].sort(key=self._rank_positions.__getitem__)
+
+        keys = self._name_keys(name_lower)
+        for gram in keys['trigram']:
+            if gram not in self._trigram_index:
+                self._register_short_grams(gram)
+
+        for index, family in ((self._prefix_index, 'prefix'),
+                              (self._word_prefix_index, 'word_prefix'),
+                              (self._trigram_index, 'trigram')):
+            for posting_key in keys[family]:
+                posting = index.get(posting_key)
+                if posting is None:
+                    index[posting_key] = np.array([product_id], dtype=np.intp)
+                else:
+                    at = np.searchsorted(self._rank_positions[posting], rank)
+                    index[posting_key] = np.insert(posting, at, product_id)
+
+        # Fuzzy postings are only counted, so their order does not matter
+        for gram in keys['fuzzy']:
+            posting = self._fuzzy_index.get(gram)
+            self._fuzzy_index[gram] = (
+                np.array([product_id], dtype=np.intp) if posting is None
+                else np.append(posting, product_id)
+            )
+
+        return product_id
+
+    def search(self, query: str, category: Optional[str] = None,
+               limit: Optional[int] = None) -> List[str]:
+        """Product names matching query, best matches first"""
+        query_lower = query.lower().strip()
+
+        if not query_lower or limit == 0:
+            return []
+
+        mask = None
+        if category:
+            mask = self._in_category.get(category)
+            if mask is None:
+                return []
+
+        results = []
+        seen = set()
+
+        for product_id in self._ranked_matches(query_lower, mask):
+            if product_id in seen:
+                continue
+            seen.add(product_id)
+            results.append(product_id)
+            if limit is not None and len(results) >= limit:
+                break
+
+        # Only look for typos when nothing contains the query
+        if not results and self.fuzzy_threshold:
+            results = self._fuzzy_matches(query_lower, mask)[:limit].tolist()
+
+        return [self._names[product_id] for product_id in results]
+
+    def _ranked_matches(self, query_lower: str, mask: Optional[np.ndarray]) -> Iterator[int]:
+        """Ids of names containing the query, tier by tier in rank order (repeats possible)"""
+        names = self._names_lower
+
+        def in_category(posting: np.ndarray) -> np.ndarray:
+            return posting if mask is None else posting[mask[posting]]
+
+        # Every name containing a query of 3+ characters is in each of its
+        # trigram postings, so the shortest one bounds every tier
+        candidates = None
+        if len(query_lower) >= GRAM_SIZE:
+            postings = [self._trigram_index.get(gram) for gram in _ngrams(query_lower, GRAM_SIZE)]
+            if any(posting is None for posting in postings):
+                return
+            candidates = in_category(min(postings, key=len))
+
+        def tier(posting: Optional[np.ndarray]) -> np.ndarray:
+            if posting is None:
+                return np.empty(0, dtype=np.intp)
+            if candidates is not None and len(candidates) < len(posting):
+                return candidates
+            return in_category(posting)
+
+        for product_id in self._exact.get(query_lower, ()):
+            if mask is None or mask[product_id]:
+                yield product_id
+
+        key = query_lower[:GRAM_SIZE]
+        for product_id in _walk(tier(self._prefix_index.get(key))):
+            if names[product_id].startswith(query_lower):
+                yield product_id
+
+        padded_query = f" {query_lower}"
+        for product_id in _walk(tier(self._word_prefix_index.get(key))):
+            if padded_query in f" {names[product_id]}":
+                yield product_id
+
+        if candidates is not None:
+            for product_id in _walk(candidates):
+                if query_lower in names[product_id]:
+                    yield product_id
+            return
+
+        # Shorter queries: every trigram that contains them, in rank order
+        postings = [self._trigram_index[gram] for gram in self._short_grams.get(query_lower, ())]
+        if postings:
+            ids = in_category(np.unique(np.concatenate(postings)))
+            yield from _walk(ids[np.argsort(self._rank_positions[ids], kind='stable')])
+
+    def _fuzzy_matches(self, query_lower: str, mask: Optional[np.ndarray]) -> np.ndarray:
+        """Ids of names sharing enough word trigrams with the query, most shared first"""
+        query_grams = _word_trigrams(query_lower)
+        postings = [self._fuzzy_index[gram] for gram in query_grams if gram in self._fuzzy_index]
+
+        if len(query_grams) < 3 or not postings:
+            return np.empty(0, dtype=np.intp)
+
+        # Count shared trigrams per name in one pass
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._names))
+        matches = np.flatnonzero(shared / len(query_grams) >= self.fuzzy_threshold)
+        if mask is not None:
+            matches = matches[mask[matches]]
+
+        # Most shared trigrams first, then name rank
+        order = np.lexsort((self._rank_positions[matches], -shared[matches]))
+        return matches[order]
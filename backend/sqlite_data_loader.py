@@ -0,0 +1,287 @@
+"""
+sqlite_data_loader.py - SQLite storage engine behind the CSVDataLoader API
+"""
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from csv_data_loader import (
+    CSVDataLoader, LANGUAGE_STATS_KEYS, REVIEW_FIELDS, SAMPLE_REVIEWS_COUNT, SUMMARY_CACHE_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 50_000  # CSV rows inserted per transaction
+# Up to this many matching products are selected with an indexed IN (...);
+# beyond it a substring test avoids SQLite's bound-parameter limit
+MAX_IN_PARAMS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    product_key TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    category TEXT,
+    text TEXT,
+    rating INTEGER NOT NULL,
+    aspect TEXT,
+    language TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_product ON reviews (product_key);
+CREATE INDEX IF NOT EXISTS idx_reviews_category ON reviews (category);
+CREATE INDEX IF NOT EXISTS idx_reviews_product_aspect ON reviews (product_key, aspect);
+"""
+
+
+class SQLiteDataLoader(CSVDataLoader):
+    """Drop-in replacement for CSVDataLoader that keeps reviews in SQLite
+
+    Filtering and aggregation run as indexed SQL queries, so workers do not
+    hold the review table in memory. Each thread gets its own connection.
+    product_key is the lowercase product name used for matching.
+    """
+
+    def __init__(self, db_path='reviews.db', csv_path='reviews_dataset.csv',
+                 summary_cache_size=SUMMARY_CACHE_SIZE):
+        """Open (and if empty, populate from csv_path) the review database"""
+        self.db_path = db_path
+        self._local = threading.local()
+        super().__init__(csv_path, summary_cache_size, use_cache=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+
+        return conn
+
+    def load_data(self):
+        """Create the schema, import the CSV into an empty database and load the catalog"""
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+
+        has_rows = conn.execute('SELECT 1 FROM reviews LIMIT 1').fetchone() is not None
+        if not has_rows and self.csv_path and os.path.exists(self.csv_path):
+            self.import_csv(self.csv_path)
+
+        self._file_signature = self._get_file_signature()
+        self._build_catalog()
+        self.clear_summary_cache()
+
+        logger.info(f"✅ Using SQLite database {self.db_path} ({len(self._catalog)} products)")
+
+    def import_csv(self, csv_path: str):
+        """Append every review of a CSV file to the database"""
+        total = 0
+
+        for chunk in pd.read_csv(csv_path, encoding='utf-8', chunksize=IMPORT_CHUNK_SIZE):
+            total += self._insert(self._clean_data(chunk))
+
+        logger.info(f"📥 Imported {total} reviews from {csv_path}")
+
+    def append_reviews(self, reviews: Union[pd.DataFrame, Iterable[Dict]]) -> int:
+        """Insert new review rows; returns the number of rows added"""
+        df = reviews.copy() if isinstance(reviews, pd.DataFrame) else pd.DataFrame(list(reviews))
+        added = self._insert(self._clean_data(df))
+
+        # Our own write: register its products and drop their stale summaries
+        self._check_for_changes()
+        return added
+
+    def _insert(self, df: pd.DataFrame) -> int:
+        """Insert cleaned review rows in one transaction"""
+        if df.empty:
+            return 0
+
+        rows = zip(
+            df['product_name'].str.lower(), df['product_name'], df['category'],
+            df['text'], df['rating'].astype(int), df['aspect'], df['language']
+        )
+
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT INTO reviews '
+                '(product_key, product_name, category, text, rating, aspect, language) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+        return len(df)
+
+    def _get_file_signature(self):
+        """Highest review id; changes whenever rows are appended"""
+        return self._connection().execute('SELECT MAX(id) FROM reviews').fetchone()[0]
+
+    def _check_for_changes(self):
+        """Register the reviews added since the last check, or reload if rows were removed"""
+        with self._data_lock:
+            last_id = self._get_file_signature()
+            seen_id = self._file_signature or 0
+
+            if last_id == self._file_signature:
+                return
+
+            if last_id is None or last_id < seen_id:
+                logger.info(f"🔄 {self.db_path} changed, reloading")
+                self.load_data()
+            else:
+                self._register_new_reviews(seen_id, last_id)
+
+    def _register_new_reviews(self, seen_id: int, last_id: int):
+        """Add the products of reviews with seen_id < id <= last_id and drop their summaries"""
+        pairs = pd.read_sql_query(
+            'SELECT DISTINCT product_name, category FROM reviews WHERE id > ? AND id <= ?',
+            self._connection(), params=(seen_id, last_id)
+        )
+        names = set(pairs['product_name'].str.lower())
+
+        for name in names:
+            self._product_index.setdefault(name)
+        self._register_products(pairs)
+        self._invalidate_summaries(names)
+        self._file_signature = last_id
+
+    def _build_catalog(self):
+        """Distinct (product_name, category) pairs in the database"""
+        catalog = pd.read_sql_query(
+            'SELECT DISTINCT product_name, category FROM reviews', self._connection()
+        )
+        self._set_catalog(catalog)
+        self._product_index = dict.fromkeys(self._catalog['product_name'].str.lower())
+
+    def _match_clause(self, product_name: str):
+        """SQL condition (and parameters) selecting all matching products; no parameters if none match"""
+        names = self._match_names(product_name)
+
+        if len(names) > MAX_IN_PARAMS:
+            return "instr(product_key, ?) > 0", [product_name.lower().strip()]
+
+        placeholders = ', '.join('?' * len(names))
+        return f"product_key IN ({placeholders})", names
+
+    def get_product_version(self, product_name: str):
+        """Count and highest id of the product's reviews (None if there are none)"""
+        clause, params = self._match_clause(product_name)
+
+        if not params:
+            return None
+
+        count, last_id = self._connection().execute(
+            f"SELECT COUNT(*), MAX(id) FROM reviews WHERE {clause}", params
+        ).fetchone()
+        return (count, last_id) if count else None
+
+    def get_product_texts(self, product_name: str) -> List[str]:
+        """Text of every review of a product, in insertion order"""
+        clause, params = self._match_clause(product_name)
+
+        if not params:
+            return []
+
+        rows = self._connection().execute(
+            f"SELECT text FROM reviews WHERE {clause} ORDER BY id", params
+        )
+        return [text or '' for text, in rows]
+
+    def get_reviews_page(self, product_name: str, limit: Optional[int] = None, offset: int = 0,
+                         language: Optional[str] = None, aspect: Optional[str] = None,
+                         min_rating: Optional[int] = None) -> Dict:
+        """One page of a product's reviews, filtered and paginated in SQL"""
+        clause, params = self._match_clause(product_name)
+
+        if not params:
+            logger.warning(f"⚠️ No reviews found for: {product_name}")
+            return self._page_result([], 0, limit, offset)
+
+        if language:
+            clause += ' AND language = ?'
+            params = params + [language]
+        if aspect:
+            clause += ' AND aspect = ?'
+            params = params + [aspect]
+        if min_rating is not None:
+            clause += ' AND rating >= ?'
+            params = params + [int(min_rating)]
+
+        total = self._connection().execute(
+            f"SELECT COUNT(*) FROM reviews WHERE {clause}", params
+        ).fetchone()[0]
+
+        if not total:
+            logger.warning(f"⚠️ No reviews found for: {product_name}")
+            return self._page_result([], 0, limit, offset)
+
+        logger.info(f"📝 Found {total} reviews for {product_name}")
+        rows = self._query_rows(clause, params, limit=limit, offset=offset)
+        return self._page_result(self._to_records(rows), total, limit, offset)
+
+    def _query_rows(self, clause: str, params: List, limit: Optional[int] = None,
+                    offset: int = 0) -> pd.DataFrame:
+        """Review rows matching a WHERE clause, in insertion order"""
+        columns = ', '.join(['category'] + REVIEW_FIELDS)
+        sql = f"SELECT {columns} FROM reviews WHERE {clause} ORDER BY id"
+        if limit is not None or offset:
+            sql += f" LIMIT {-1 if limit is None else int(limit)} OFFSET {int(offset)}"
+
+        return pd.read_sql_query(sql, self._connection(), params=params)
+
+    def _compute_summary(self, product_name: str) -> Optional[Dict]:
+        """Aggregate a product's reviews in SQL"""
+        clause, params = self._match_clause(product_name)
+
+        if not params:
+            return None
+
+        conn = self._connection()
+        aspect_rows = conn.execute(
+            f"SELECT aspect, SUM(rating), COUNT(*) FROM reviews WHERE {clause} "
+            f"GROUP BY aspect", params
+        ).fetchall()
+
+        if not aspect_rows:
+            return None
+
+        language_counts = dict(conn.execute(
+            f"SELECT language, COUNT(*) FROM reviews WHERE {clause} GROUP BY language", params
+        ).fetchall())
+
+        sample_rows = self._query_rows(clause, params, limit=SAMPLE_REVIEWS_COUNT)
+        total_reviews = sum(count for _, _, count in aspect_rows)
+        total_rating = sum(aspect_sum for _, aspect_sum, _ in aspect_rows)
+
+        return {
+            'product_name': product_name,
+            'category': sample_rows['category'].iloc[0],
+            'total_reviews': total_reviews,
+            'overall_score': round(total_rating / total_reviews * 2, 1),
+            'aspect_scores': {
+                aspect: int(aspect_sum * 20 / count)
+                for aspect, aspect_sum, count in aspect_rows if aspect is not None
+            },
+            'language_stats': {
+                lang: language_counts.get(lang, 0) for lang in LANGUAGE_STATS_KEYS
+            },
+            'sample_reviews': self._to_records(sample_rows)
+        }
+
+    def memory_report(self) -> Dict[str, int]:
+        """Print the on-disk size of the database and in-memory size of the catalog"""
+        report = {
+            'database_file': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+            'catalog': int(self._get_catalog().memory_usage(deep=True).sum())
+        }
+
+        for name, size in report.items():
+            print(f"{name:<36} {size:>12,} bytes")
+
+        return report
@@ -1,8 +1,60 @@
 """
 Test script to verify CSV data loading works correctly
 """
-from csv_data_loader import CSVDataLoader
+from csv_data_loader import CSVDataLoader, StreamingCSVDataLoader
+from sqlite_data_loader import SQLiteDataLoader
+from search_index import ProductSearchIndex
 import json
+import os
+import shutil
+import tempfile
+
+SEARCH_QUERIES = ['samsung', 'iph', 'galxy', 'pro', 'a']
+PAGE_SIZE = 7
+NEW_REVIEWS = [
+    {'product_name': 'iPhone 15', 'category': 'phone', 'text': 'Battery lasts all day',
+     'rating': 5, 'aspect': 'Battery', 'language': 'english'},
+    {'product_name': 'Test Phone X1', 'category': 'phone', 'text': 'कैमरा अच्छा है',
+     'rating': 4, 'aspect': 'Camera', 'language': 'hindi'}
+]
+
+
+def all_pages(loader, product_name):
+    """Walk a product's reviews page by page through next_offset"""
+    reviews = []
+    offset = 0
+    
+    while offset is not None:
+        page = loader.get_reviews_page(product_name, limit=PAGE_SIZE, offset=offset)
+        reviews.extend(page['reviews'])
+        offset = page['next_offset']
+    
+    return reviews
+
+
+def comparable(comparison):
+    """compare_products() result with its aspect list in a fixed order"""
+    return dict(comparison, aspects=sorted(comparison.get('aspects', []), key=lambda a: a['aspect']))
+
+
+def check_same_results(loader, reference, label):
+    """Assert loader answers every query exactly like the in-memory reference loader"""
+    products = reference.get_all_products()
+    categories = [None] + reference.get_categories()
+    
+    assert sorted(loader.get_all_products()) == sorted(products), label
+    for product in products:
+        assert loader.get_product_summary(product) == reference.get_product_summary(product), \
+            f"{label}: summary of {product}"
+        assert all_pages(loader, product) == reference.get_reviews_page(product)['reviews'], \
+            f"{label}: pages of {product}"
+    
+    assert comparable(loader.compare_products('iPhone 15', 'Samsung S24')) == \
+        comparable(reference.compare_products('iPhone 15', 'Samsung S24')), label
+    for query in SEARCH_QUERIES:
+        for category in categories:
+            assert loader.search_products(query, category) == \
+                reference.search_products(query, category), f"{label}: search {query!r}"
 
 def test_data_loader():
     print("=" * 80)
@@ -74,6 +126,67 @@ def test_data_loader():
         print(f"{category.upper()}: {len(products)} products - {products}")
     print()
     
+    # Test 9: Memory footprint
+    print("✅ Test 9: Memory Report")
+    loader.memory_report()
+    print()
+    
+    # Test 10-12 run every storage engine on its own copy of the dataset
+    workdir = tempfile.mkdtemp()
+    try:
+        copies = {}
+        for name in ('memory', 'streaming', 'sqlite'):
+            copies[name] = os.path.join(workdir, f"{name}.csv")
+            shutil.copy(loader.csv_path, copies[name])
+        
+        engines = {
+            'streaming': StreamingCSVDataLoader(copies['streaming']),
+            'sqlite': SQLiteDataLoader(os.path.join(workdir, 'reviews.db'), copies['sqlite'])
+        }
+        reference = CSVDataLoader(copies['memory'], use_cache=False)
+        
+        # Test 10: Storage engines agree with the in-memory loader
+        print("✅ Test 10: Streaming and SQLite Loaders Match CSVDataLoader")
+        for name, engine in engines.items():
+            check_same_results(engine, reference, name)
+            print(f"{name}: summaries, pages, comparison and search match")
+        print()
+        
+        # Test 11: Summaries after appending reviews
+        print("✅ Test 11: Summaries After append_reviews")
+        before = reference.get_product_summary('iPhone 15')['total_reviews']
+        for engine in [reference, *engines.values()]:
+            assert engine.append_reviews(NEW_REVIEWS) == len(NEW_REVIEWS)
+        for name, engine in engines.items():
+            check_same_results(engine, reference, f"{name} after append")
+        after = reference.get_product_summary('iPhone 15')['total_reviews']
+        assert after == before + 1
+        assert reference.search_products('x1') == ['Test Phone X1']
+        print(f"iPhone 15 reviews: {before} -> {after}, all engines still match")
+        print()
+        
+        # Test 12: Reloading a file the loader appended to gives the same answers
+        print("✅ Test 12: Reload After Append")
+        check_same_results(CSVDataLoader(copies['memory'], use_cache=False), reference, 'reloaded')
+        print("Reloaded CSV matches the appended in-memory state")
+        print()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    # Test 13: Search index built incrementally
+    print("✅ Test 13: Incremental Search Index Matches Bulk Build")
+    pairs = list(loader._get_catalog().itertuples(index=False, name=None))
+    bulk = ProductSearchIndex(pairs)
+    incremental = ProductSearchIndex([])
+    for pair in reversed(pairs):
+        incremental.add(*pair)
+    for query in SEARCH_QUERIES:
+        for category in [None] + categories:
+            for limit in (None, 1, 3):
+                assert incremental.search(query, category, limit) == bulk.search(query, category, limit)
+    print(f"{len(bulk)} products, {len(SEARCH_QUERIES)} queries match")
+    print()
+    
     print("=" * 80)
     print("✅ All tests completed!")
     print("=" * 80)
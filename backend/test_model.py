@@ -1,3 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from csv_data_loader import CSVDataLoader
+from inference_scheduler import InferenceScheduler
 from models import SentimentAnalyzer
 from preprocessor import TextPreprocessor
 
@@ -27,4 +31,31 @@ for review in test_reviews:
         sentiment = "Neutral ⚖️"
     
     print(f"Review: {review}")
-    print(f"Score: {score:.2f} → {sentiment}\n")
\ No newline at end of file
+    print(f"Score: {score:.2f} → {sentiment}\n")
+
+# Batched scoring
+print("🧪 Testing Batch Prediction...\n")
+
+results = analyzer.predict_batch([preprocessor.clean_text(review) for review in test_reviews])
+
+for review, result in zip(test_reviews, results):
+    print(f"Review: {review}")
+    print(f"Score: {result['score']:.2f} | Probabilities: {result['probabilities']}\n")
+
+stats = analyzer.last_batch_stats
+print(f"Scored {stats['texts']} texts in {stats['seconds']:.2f}s ({stats['texts_per_sec']:.1f} texts/sec)")
+
+# Micro-batched scoring from many threads
+print("\n🧪 Testing InferenceScheduler...\n")
+
+texts = CSVDataLoader('reviews_dataset.csv').df['text'].fillna('').map(preprocessor.clean_text).tolist()
+expected = [result['score'] for result in analyzer.predict_batch(texts)]
+
+# A memory-only analyzer so the scheduler scores every text instead of reading the cache
+scheduler = InferenceScheduler(SentimentAnalyzer(cache_path=None))
+with ThreadPoolExecutor(max_workers=8) as pool:
+    scores = list(pool.map(scheduler.predict, texts))
+scheduler.close()
+
+assert all(abs(score - want) < 1e-4 for score, want in zip(scores, expected)), "scheduler scores differ"
+print(f"{len(texts)} dataset reviews match predict_batch: {scheduler.metrics()}")
@@ -75,8 +75,8 @@ trainer = Trainer(
 print("🔥 Training started...")
 trainer.train()
 
-# Save model
-model.save_pretrained('./trained_model')
+# Save model (safetensors, so inference processes can memory-map the weights)
+model.save_pretrained('./trained_model', safe_serialization=True)
 tokenizer.save_pretrained('./trained_model')
 
 print("✅ Model saved to ./trained_model")
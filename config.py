@@ -5,6 +5,9 @@ config.py - Configuration settings for the product comparison system
 # Model Configuration
 MODEL_PATH = './trained_model'
 MODEL_NAME = 'xlm-roberta-base'  # Used for initial training
+# Inference backend: 'torch' (fp32), 'quantized' (dynamic int8, CPU) or
+# 'onnx' (ONNX Runtime from backend/requirements-onnx.txt; run backend/export_model.py first)
+INFERENCE_BACKEND = 'torch'
 
 # Scraping Configuration
 MAX_REVIEWS_DEFAULT = 30